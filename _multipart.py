@@ -0,0 +1,65 @@
+"""Single-file multipart/form-data upload bodies shared by test_full.py and test_llm.py."""
+import functools
+import hashlib
+import os
+
+CHUNK_SIZE = 1 << 20  # upload in 1 MiB reads — the file is never held in the heap whole
+
+
+class MultipartFile:
+    """Cached preamble + trailer around a file that is streamed from disk on every upload."""
+
+    __slots__ = ("path", "boundary", "preamble", "trailer", "size", "_sha256")
+
+    def __init__(self, path, field, boundary, size):
+        self.path = path
+        self.boundary = boundary
+        self.size = size
+        self.preamble = (
+            f'--{boundary}\r\n'
+            f'Content-Disposition: form-data; name="{field}"; filename="{os.path.basename(path)}"\r\n'
+            f'Content-Type: text/csv\r\n\r\n'
+        ).encode()
+        self.trailer = f'\r\n--{boundary}--\r\n'.encode()
+        self._sha256 = None
+
+    @property
+    def headers(self):
+        # An exact Content-Length keeps httpx from falling back to a chunked upload
+        return {
+            'Content-Type': f'multipart/form-data; boundary={self.boundary}',
+            'Content-Length': str(len(self.preamble) + self.size + len(self.trailer)),
+        }
+
+    @property
+    def sha256(self):
+        # Digest of the file alone — the cache key for a parsed analysis
+        if self._sha256 is None:
+            digest = hashlib.sha256()
+            with open(self.path, 'rb') as f:
+                for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+                    digest.update(chunk)
+            self._sha256 = digest.hexdigest()
+        return self._sha256
+
+    def chunks(self):
+        yield self.preamble
+        with open(self.path, 'rb') as f:
+            yield from iter(lambda: f.read(CHUNK_SIZE), b'')
+        yield self.trailer
+
+    async def achunks(self):
+        # httpx.AsyncClient only streams async iterables
+        for chunk in self.chunks():
+            yield chunk
+
+
+@functools.lru_cache(maxsize=8)
+def _build_multipart(path, mtime_ns, size, field, boundary):
+    return MultipartFile(path, field, boundary, size)
+
+
+def build_multipart(path, field='file', boundary='----RiftFormBoundary'):
+    """One MultipartFile per (path, mtime, field, boundary) — an edited file gets a fresh envelope and digest."""
+    st = os.stat(path)
+    return _build_multipart(os.path.abspath(path), st.st_mtime_ns, st.st_size, field, boundary)
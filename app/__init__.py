@@ -0,0 +1 @@
+# App package
@@ -0,0 +1 @@
+# Agents package
@@ -0,0 +1,662 @@
+"""
+Agent 3: Quantum Agent
+Uses Qiskit Aer simulator to run QAOA for community detection on suspicious subgraphs.
+Generates quantum circuits, measurement histograms, and quantum-enhanced scores.
+"""
+
+import os
+import numpy as np
+import networkx as nx
+from networkx.algorithms import isomorphism
+import base64
+import copy
+import hashlib
+import io
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Dict, List, Optional
+
+# Qiskit imports (with graceful fallback)
+try:
+    from qiskit import QuantumCircuit
+    from qiskit.circuit import ParameterVector
+    from qiskit_aer import AerSimulator
+    QISKIT_AVAILABLE = True
+except ImportError:
+    QISKIT_AVAILABLE = False
+
+# Optional: QAOAKit's table of optimal Max-Cut angles for small graphs
+try:
+    from QAOAKit import opt_angles_for_graph, angles_to_qaoa_format
+    QAOAKIT_AVAILABLE = True
+except ImportError:
+    QAOAKIT_AVAILABLE = False
+
+# Optional: Numba JIT for the cut-value kernel (NumPy fallback below)
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# Weisfeiler-Lehman hash of a ring topology → pretrained unit-weight (gammas, betas) or None
+_PRETRAINED_ANGLES: Dict[str, Optional[tuple]] = {}
+
+# Exact ring signature (ordered members + weighted edges + angles + shots) → the
+# finished per-ring result, so repeat analyses skip circuit build, simulation and
+# post-processing outright; LRU-bounded, shared by every QuantumAgent instance
+QUANTUM_CACHE_SIZE = 64
+_QUANTUM_CACHE: "OrderedDict[bytes, Dict]" = OrderedDict()
+_QUANTUM_CACHE_LOCK = threading.Lock()
+
+
+@lru_cache(maxsize=256)
+def _cached_qaoa_template(n_qubits: int, edges_key: tuple, layers: int) -> tuple:
+    """
+    Build the parametric QAOA Max-Cut circuit once per ring topology (n, weighted edge set).
+    Returns (circuit, gammas, betas) where the angles are unbound ParameterVectors;
+    the cached circuit is shared, so bind it with assign_parameters (which copies).
+    """
+    gammas = ParameterVector("γ", layers)
+    betas = ParameterVector("β", layers)
+    qc = QuantumCircuit(n_qubits, n_qubits)
+
+    # Initial superposition
+    for i in range(n_qubits):
+        qc.h(i)
+
+    # QAOA layers
+    for layer in range(layers):
+        # Cost unitary (ZZ interactions for edges)
+        for (u, v, weight) in edges_key:
+            qc.cx(u, v)
+            qc.rz(2 * gammas[layer] * weight, v)
+            qc.cx(u, v)
+
+        # Mixer unitary (X rotations)
+        for i in range(n_qubits):
+            qc.rx(2 * betas[layer], i)
+
+    # Measurement
+    qc.measure(range(n_qubits), range(n_qubits))
+
+    return qc, gammas, betas
+
+
+def _bind_qaoa_circuit(n_qubits: int, edges_key: tuple, gammas: tuple, betas: tuple) -> "QuantumCircuit":
+    """Concrete QAOA circuit for the given per-layer angles."""
+    qc, g, b = _cached_qaoa_template(n_qubits, edges_key, len(gammas))
+    return qc.assign_parameters({g: list(gammas), b: list(betas)})
+
+
+@lru_cache(maxsize=64)
+def _cached_circuit_image(n_qubits: int, edges_key: tuple, gammas: tuple, betas: tuple) -> Optional[str]:
+    """Circuit PNG (base64) for a topology + angles — matplotlib rendering is the slow part."""
+    return QuantumAgent._circuit_to_base64(_bind_qaoa_circuit(n_qubits, edges_key, gammas, betas))
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True, fastmath=True)
+    def _cuts_kernel(bits_mat, edges_np, weights_np):
+        """Weighted cut of each bitstring row — tight compiled loop, no (K, E) temporaries."""
+        out = np.empty(bits_mat.shape[0], np.float64)
+        for k in range(bits_mat.shape[0]):
+            c = 0.0
+            for e in range(edges_np.shape[0]):
+                if bits_mat[k, edges_np[e, 0]] != bits_mat[k, edges_np[e, 1]]:
+                    c += weights_np[e]
+            out[k] = c
+        return out
+
+
+def _clean_bitstring(bs: str, n: int) -> str:
+    """Strip register separators and pad/trim a Qiskit bitstring to exactly n bits."""
+    return bs.replace(" ", "").zfill(n)[-n:]
+
+
+def _bs_to_bits(bs: str) -> np.ndarray:
+    """Convert a clean bitstring into a uint8 array indexed by qubit (qubit 0 = rightmost char)."""
+    return (np.frombuffer(bs.encode(), dtype=np.uint8) - ord("0"))[::-1]
+
+
+class QuantumAgent:
+    """Agent responsible for quantum-enhanced fraud community detection."""
+    
+    MAX_QUBITS = 6    # Reduced from 8 — cuts circuit size, big speed win on free tier
+    QAOA_LAYERS = 1   # Single layer is enough for partitioning
+    # Per-layer angles (pre-tuned for typical fraud subgraphs), bound into the
+    # cached parametric circuit at run time
+    GAMMAS = (0.75, 1.15)
+    BETAS = (0.45, 0.65)
+    SHOTS = 256       # Halved again — still statistically meaningful
+    ALPHA_CVAR = 0.25  # Fraction of best-cut shots the CVaR objective averages over
+
+    # One AerSimulator per process — the agent is rebuilt on every request,
+    # the backend does not need to be
+    _simulator_cache = None
+
+    # (n, WL hash, angles) → [(labelled graph, counts)] from earlier simulations;
+    # isomorphic rings reuse a histogram instead of re-running the circuit
+    RING_RESULT_CACHE_SIZE = 128
+    _ring_result_cache: "OrderedDict[tuple, List[tuple]]" = OrderedDict()
+    _ring_result_lock = threading.Lock()
+    
+    def __init__(self, G: nx.DiGraph, suspicious_subgraphs: List[Dict] = None):
+        self.G = G
+        self.suspicious_subgraphs = suspicious_subgraphs or []
+
+    @classmethod
+    def _get_simulator(cls) -> "AerSimulator":
+        """Return the shared simulator backend, creating it on first use (GPU if Aer has one)."""
+        if cls._simulator_cache is None:
+            sim = AerSimulator()
+            if "GPU" in sim.available_devices():
+                sim = AerSimulator(method="statevector", device="GPU")
+            cls._simulator_cache = sim
+        return cls._simulator_cache
+    
+    # Env-configurable: set MAX_QUANTUM_RINGS=0 in Render to skip all circuits
+    TOP_RINGS_LIMIT = int(os.getenv("MAX_QUANTUM_RINGS", "5"))  # default 5 (was 10)
+
+    def run(self) -> Dict:
+        """Run quantum analysis on the top-N most critical rings only."""
+        if not QISKIT_AVAILABLE:
+            return {
+                "quantum_available": False,
+                "agent": "quantum_optimizer",
+                "message": "Qiskit not installed — skipping quantum analysis"
+            }
+
+        quantum_results = []
+        all_quantum_scores = {}
+
+        # Sort rings by risk_score descending and split into top-N vs rest
+        sorted_rings = sorted(
+            self.suspicious_subgraphs,
+            key=lambda r: r.get("risk_score", 0),
+            reverse=True,
+        )
+        top_rings = sorted_rings[:self.TOP_RINGS_LIMIT]
+        remaining_rings = sorted_rings[self.TOP_RINGS_LIMIT:]
+
+        # ── Full QAOA circuits for critical top rings (one batched Aer job) ──
+        batch = []
+        for ring_info in top_rings:
+            members = ring_info.get("member_accounts", [])
+            ring_id = ring_info.get("ring_id", "UNKNOWN")
+
+            if len(members) < 2:
+                continue
+
+            batch.append((members[:self.MAX_QUBITS], ring_id))
+
+        for result in self._run_qaoa_batch(batch):
+            quantum_results.append(result)
+            for acc, score in result.get("quantum_scores", {}).items():
+                if acc not in all_quantum_scores:
+                    all_quantum_scores[acc] = score
+                else:
+                    all_quantum_scores[acc] = max(all_quantum_scores[acc], score)
+
+        # ── Heuristic-only scores for the remaining rings (no circuit) ──
+        for ring_info in remaining_rings:
+            members = ring_info.get("member_accounts", [])
+            ring_id = ring_info.get("ring_id", "UNKNOWN")
+            risk = ring_info.get("risk_score", 0)
+
+            if len(members) < 2:
+                continue
+
+            # Approximate quantum scores from the classical risk score
+            approx_scores = {}
+            for acc in members:
+                approx_scores[acc] = round(min(risk * 0.85, 100.0), 2)
+
+            quantum_results.append({
+                "ring_id": ring_id,
+                "n_qubits": 0,
+                "qaoa_layers": 0,
+                "shots": 0,
+                "optimal_bitstring": None,
+                "top_measurements": [],
+                "quantum_scores": approx_scores,
+                "circuit_image": None,
+                "circuit_depth": 0,
+                "gate_count": 0,
+                "partition_score": 0,
+                "suspicious_set": members,
+                "skipped": True,
+                "skip_reason": f"Ring below top-{self.TOP_RINGS_LIMIT} threshold — heuristic score used",
+            })
+
+            for acc, score in approx_scores.items():
+                if acc not in all_quantum_scores:
+                    all_quantum_scores[acc] = score
+                else:
+                    all_quantum_scores[acc] = max(all_quantum_scores[acc], score)
+
+        return {
+            "quantum_available": True,
+            "quantum_results": quantum_results,
+            "quantum_scores": all_quantum_scores,
+            "circuits_executed": len(top_rings),
+            "circuits_skipped": len(remaining_rings),
+            "agent": "quantum_optimizer"
+        }
+    
+    def _run_qaoa_batch(self, batch: List[tuple]) -> List[Dict]:
+        """
+        Run QAOA Max-Cut for several rings with a single simulator job.
+        `batch` holds (members, ring_id) pairs; rings that fail to build are
+        reported with an error entry instead of aborting the whole batch.
+        Rings isomorphic to one simulated earlier reuse its histogram.
+        """
+        image_budget = 3  # Only render circuit PNGs for top 3 rings (expensive)
+        results: List[Optional[Dict]] = [None] * len(batch)
+        prepared = []
+
+        for i, (members, ring_id) in enumerate(batch):
+            try:
+                subG = self._build_ring_subgraph(members)
+                signature = self._ring_signature(members, subG, image_budget > 0)
+                cached = self._lookup_ring_result(signature)
+                if cached is not None:
+                    cached["ring_id"] = ring_id
+                    results[i] = cached
+                    image_budget -= 1
+                    continue
+                qc = self._build_qaoa_circuit(len(members), subG)
+                labelled = self._labelled_graph(len(members), subG)
+                cache_key = self._ring_cache_key(labelled, subG)
+            except Exception as e:
+                results[i] = {"ring_id": ring_id, "error": str(e), "quantum_scores": {}}
+                continue
+            prepared.append({
+                "index": i, "members": members, "ring_id": ring_id, "subG": subG, "qc": qc,
+                "render_image": image_budget > 0, "labelled": labelled, "cache_key": cache_key,
+                "signature": signature,
+            })
+            image_budget -= 1
+
+        counts_by_index: Dict[int, Dict[str, int]] = {}
+        to_simulate = []
+        for p in prepared:
+            cached = self._lookup_ring_counts(p["cache_key"], p["labelled"])
+            if cached is None:
+                to_simulate.append(p)
+            else:
+                counts_by_index[p["index"]] = cached
+
+        # Only touch the simulator backend when there is at least one circuit to run
+        if to_simulate:
+            try:
+                # One job for every circuit — amortises Aer's per-run setup.
+                # Aer simulates on its own executor thread, so render the
+                # circuit PNGs (the slow classical step) while it runs
+                job = self._get_simulator().run([p["qc"] for p in to_simulate], shots=self.SHOTS)
+                for p in prepared:
+                    if p["render_image"]:
+                        self._circuit_image(len(p["members"]), p["subG"])
+                sim_result = job.result()
+                for k, p in enumerate(to_simulate):
+                    counts = sim_result.get_counts(k)
+                    counts_by_index[p["index"]] = counts
+                    self._store_ring_counts(p["cache_key"], p["labelled"], counts)
+            except Exception as e:
+                for p in to_simulate:
+                    results[p["index"]] = {"ring_id": p["ring_id"], "error": str(e), "quantum_scores": {}}
+
+        for p in prepared:
+            counts = counts_by_index.get(p["index"])
+            if counts is None:
+                continue
+            try:
+                results[p["index"]] = self._process_counts(
+                    p["members"], p["ring_id"], p["subG"], p["qc"], counts,
+                    render_image=p["render_image"],
+                )
+                self._store_ring_result(p["signature"], results[p["index"]])
+            except Exception as e:
+                results[p["index"]] = {"ring_id": p["ring_id"], "error": str(e), "quantum_scores": {}}
+
+        return [r for r in results if r is not None]
+
+    # ── Exact-signature result cache ──
+
+    def _ring_signature(self, members: List[str], subG: nx.Graph, render_image: bool) -> bytes:
+        """Digest of everything a ring's result depends on (member order fixes the qubit mapping)."""
+        raw = repr((tuple(members), self._edges_key(subG), self._qaoa_angles(subG),
+                    self.QAOA_LAYERS, self.SHOTS, self.ALPHA_CVAR, render_image))
+        return hashlib.blake2b(raw.encode(), digest_size=16).digest()
+
+    @staticmethod
+    def _lookup_ring_result(signature: bytes) -> Optional[Dict]:
+        with _QUANTUM_CACHE_LOCK:
+            result = _QUANTUM_CACHE.get(signature)
+            if result is None:
+                return None
+            _QUANTUM_CACHE.move_to_end(signature)
+        return copy.deepcopy(result)
+
+    @staticmethod
+    def _store_ring_result(signature: bytes, result: Dict):
+        result = copy.deepcopy(result)
+        with _QUANTUM_CACHE_LOCK:
+            _QUANTUM_CACHE[signature] = result
+            _QUANTUM_CACHE.move_to_end(signature)
+            while len(_QUANTUM_CACHE) > QUANTUM_CACHE_SIZE:
+                _QUANTUM_CACHE.popitem(last=False)
+
+    # ── Isomorphic-ring result cache ──
+
+    @staticmethod
+    def _labelled_graph(n_qubits: int, subG: nx.Graph) -> nx.Graph:
+        """Max-Cut graph over all n qubits with string weight labels (for hashing / matching)."""
+        H = nx.Graph()
+        H.add_nodes_from(range(n_qubits))
+        H.add_edges_from(
+            (u, v, {"w": f"{w:.6f}"}) for u, v, w in subG.edges(data="weight", default=1.0)
+        )
+        return H
+
+    def _ring_cache_key(self, labelled: nx.Graph, subG: nx.Graph) -> tuple:
+        """Isomorphism-invariant key: qubit count, WL hash of the weighted graph, QAOA angles."""
+        wl_hash = nx.weisfeiler_lehman_graph_hash(labelled, edge_attr="w", iterations=3)
+        return labelled.number_of_nodes(), wl_hash, self._qaoa_angles(subG)
+
+    @classmethod
+    def _lookup_ring_counts(cls, key: tuple, labelled: nx.Graph) -> Optional[Dict[str, int]]:
+        """Histogram of an earlier isomorphic ring, relabelled onto this ring's qubits."""
+        with cls._ring_result_lock:
+            entries = cls._ring_result_cache.get(key)
+            if entries is None:
+                return None
+            cls._ring_result_cache.move_to_end(key)
+            entries = list(entries)
+
+        # WL hashes can collide — confirm with an exact weighted isomorphism
+        for cached_graph, counts in entries:
+            matcher = isomorphism.GraphMatcher(
+                cached_graph, labelled, edge_match=lambda a, b: a["w"] == b["w"]
+            )
+            if matcher.is_isomorphic():
+                return cls._relabel_counts(counts, matcher.mapping, labelled.number_of_nodes())
+        return None
+
+    @classmethod
+    def _store_ring_counts(cls, key: tuple, labelled: nx.Graph, counts: Dict[str, int]) -> None:
+        with cls._ring_result_lock:
+            cls._ring_result_cache.setdefault(key, []).append((labelled, dict(counts)))
+            cls._ring_result_cache.move_to_end(key)
+            while len(cls._ring_result_cache) > cls.RING_RESULT_CACHE_SIZE:
+                cls._ring_result_cache.popitem(last=False)
+
+    @staticmethod
+    def _relabel_counts(counts: Dict[str, int], mapping: Dict[int, int], n_qubits: int) -> Dict[str, int]:
+        """Move each cached qubit's bit to the position of the qubit it maps onto."""
+        relabelled = {}
+        for bs, cnt in counts.items():
+            bits = ["0"] * n_qubits
+            for q, ch in enumerate(reversed(_clean_bitstring(bs, n_qubits))):
+                bits[n_qubits - 1 - mapping[q]] = ch
+            relabelled["".join(bits)] = cnt
+        return relabelled
+
+    def _build_ring_subgraph(self, members: List[str]) -> nx.Graph:
+        """Undirected, weight-normalised Max-Cut graph over the ring members (qubit indices)."""
+        n_qubits = len(members)
+
+        # Build subgraph (undirected for Max-Cut) in one pass over members' out-edges,
+        # merging both directions of a pair onto its canonical (min, max) key
+        idx = {acc: i for i, acc in enumerate(members)}
+        pair_weights: Dict[tuple, float] = {}
+        for u, i in idx.items():
+            for v, data in self.G.succ[u].items():
+                j = idx.get(v)
+                if j is None or j == i:
+                    continue
+                key = (i, j) if i < j else (j, i)
+                pair_weights[key] = pair_weights.get(key, 0) + data.get("total_amount", 1)
+
+        subG = nx.Graph()
+        for (i, j), weight in pair_weights.items():
+            if weight > 0:
+                # Normalize weight to [0, 1]
+                subG.add_edge(i, j, weight=min(weight / 10000, 1.0))
+
+        if subG.number_of_edges() == 0:
+            # Add default connections for fully disconnected sets
+            for i in range(n_qubits - 1):
+                subG.add_edge(i, i + 1, weight=0.5)
+
+        return subG
+
+    def _process_counts(self, members: List[str], ring_id: str, subG: nx.Graph,
+                        qc: "QuantumCircuit", counts: Dict[str, int],
+                        render_image: bool = True) -> Dict:
+        """
+        Turn a ring's measurement histogram into partition + per-account scores.
+        Partitions accounts into fraud (1) vs uncertain (0).
+        """
+        n_qubits = len(members)
+
+        # Histogram as parallel arrays: bitstrings cleaned once + uint32 counts;
+        # every statistic below is a NumPy call on these
+        bitstrings = [_clean_bitstring(bs, n_qubits) for bs in counts]
+        cnt_arr = np.fromiter(counts.values(), dtype=np.uint32, count=len(counts))
+        total = int(cnt_arr.sum())
+        probs = cnt_arr / total
+
+        # Stack every measured bitstring into one (K, n) bit matrix and evaluate
+        # all their cut values in a single vectorised pass
+        bits_mat = np.stack([_bs_to_bits(bs) for bs in bitstrings])
+        edges_np = np.asarray(list(subG.edges()), dtype=np.int64)
+        weights_np = np.fromiter(
+            (w for _, _, w in subG.edges(data="weight", default=1.0)),
+            dtype=np.float64, count=len(edges_np),
+        )
+        cuts = self._compute_cut_values(bits_mat, edges_np, weights_np)
+
+        # CVaR: rank measurements by cut value and average only the best α fraction
+        # of shots; the optimal partition comes from that tail, not the modal state
+        order = np.lexsort((-probs, -cuts))  # best cut first, ties → most frequent
+        tail_shots = self.ALPHA_CVAR * total
+        ranked_counts = cnt_arr[order].astype(np.float64)
+        taken = np.clip(tail_shots - (np.cumsum(ranked_counts) - ranked_counts), 0, ranked_counts)
+        cvar_value = round(float(taken @ cuts[order] / tail_shots), 4)
+
+        # Find optimal bitstring
+        best = int(order[0])
+        best_bitstring = bitstrings[best]
+
+        # Calculate quantum scores per account: marginal probability of each
+        # qubit being in partition '1' (suspicious) — one (K,) @ (K, n) product
+        marginals = probs @ bits_mat
+        quantum_scores = {
+            account: round(float(marginals[idx]) * 100, 2)
+            for idx, account in enumerate(members)
+        }
+
+        # Generate circuit diagram as base64 image (only when requested)
+        circuit_image_b64 = self._circuit_image(n_qubits, subG) if render_image else None
+
+        # Top measurement results as structured list (by frequency) — partial
+        # select of the 10 largest counts instead of sorting every unique bitstring
+        k_top = min(10, len(cnt_arr))
+        top_idx = np.argpartition(cnt_arr, len(cnt_arr) - k_top)[-k_top:]
+        top_idx = top_idx[np.argsort(-probs[top_idx], kind="stable")]
+        top_measurements = [
+            {"bitstring": bitstrings[k], "count": int(cnt_arr[k]),
+             "probability": round(float(probs[k]), 4), "cut_value": round(float(cuts[k]), 4)}
+            for k in top_idx
+        ]
+
+        # Partition score: Max-Cut value of best bitstring
+        partition_score = round(float(cuts[best]), 4)
+
+        # Suspicious set: accounts where qubit measured '1' in best bitstring
+        suspicious_set = [members[idx] for idx in np.flatnonzero(bits_mat[best])]
+
+        return {
+            "ring_id": ring_id,
+            "n_qubits": n_qubits,
+            "qaoa_layers": self.QAOA_LAYERS,
+            "shots": self.SHOTS,
+            "optimal_bitstring": best_bitstring,
+            "top_measurements": top_measurements,
+            "quantum_scores": quantum_scores,
+            "circuit_image": circuit_image_b64,
+            "circuit_depth": qc.depth(),
+            "gate_count": qc.size(),
+            "partition_score": partition_score,
+            "cvar_alpha": self.ALPHA_CVAR,
+            "cvar_value": cvar_value,
+            "suspicious_set": suspicious_set
+        }
+
+    @staticmethod
+    def _compute_cut_values(bits_mat: np.ndarray, edges_np: np.ndarray, weights_np: np.ndarray) -> np.ndarray:
+        """Weighted Max-Cut value of every row of a (K, n) bit matrix."""
+        if NUMBA_AVAILABLE:
+            return _cuts_kernel(np.ascontiguousarray(bits_mat), edges_np, weights_np)
+        # NumPy fallback: one (K, E) XOR + matmul
+        cut = bits_mat[:, edges_np[:, 0]] ^ bits_mat[:, edges_np[:, 1]]
+        return cut @ weights_np
+
+    @staticmethod
+    def _edges_key(subG: nx.Graph) -> tuple:
+        """Hashable, order-independent description of a weighted Max-Cut graph."""
+        return tuple(sorted(
+            (u, v, round(w, 6)) for u, v, w in subG.edges(data="weight", default=1.0)
+        ))
+
+    def _build_qaoa_circuit(self, n_qubits: int, subG: nx.Graph) -> "QuantumCircuit":
+        """Build (or reuse the memoised) QAOA circuit for Max-Cut."""
+        return _bind_qaoa_circuit(n_qubits, self._edges_key(subG), *self._qaoa_angles(subG))
+
+    def _circuit_image(self, n_qubits: int, subG: nx.Graph) -> Optional[str]:
+        """Base64 PNG of the ring's bound circuit (memoised per topology + angles)."""
+        return _cached_circuit_image(n_qubits, self._edges_key(subG), *self._qaoa_angles(subG))
+
+    def _qaoa_angles(self, subG: nx.Graph) -> tuple:
+        """
+        (gammas, betas) for the configured number of QAOA layers.
+        Uses QAOAKit's pretrained angles for the ring's isomorphism class when
+        available, falling back to the pre-tuned class constants.
+        """
+        if QAOAKIT_AVAILABLE:
+            key = nx.weisfeiler_lehman_graph_hash(subG)
+            if key not in _PRETRAINED_ANGLES:
+                _PRETRAINED_ANGLES[key] = self._lookup_pretrained_angles(subG)
+            if _PRETRAINED_ANGLES[key] is not None:
+                # The optimum is for unit weights, but the circuit folds each edge
+                # weight into its ZZ angle — rescale γ so the heaviest edge is 1
+                gammas, betas = _PRETRAINED_ANGLES[key]
+                w_max = max(w for _, _, w in subG.edges(data="weight", default=1.0))
+                return tuple(round(g / w_max, 6) for g in gammas), betas
+        return self.GAMMAS[:self.QAOA_LAYERS], self.BETAS[:self.QAOA_LAYERS]
+
+    def _lookup_pretrained_angles(self, subG: nx.Graph) -> Optional[tuple]:
+        """QAOAKit optimum for the unweighted topology, converted to this circuit's convention."""
+        try:
+            angles = angles_to_qaoa_format(opt_angles_for_graph(nx.Graph(subG.edges()), self.QAOA_LAYERS))
+        except Exception:
+            return None
+        # exp(-iγC) with C = ½Σ(1 - ZZ) equals exp(+iγ/2 ΣZZ) up to phase → our ZZ angle is -γ/2
+        gammas = tuple(round(-float(g) / 2, 6) for g in angles["gamma"])
+        betas = tuple(round(float(b), 6) for b in angles["beta"])
+        return gammas, betas
+    
+    @staticmethod
+    def _circuit_to_base64(qc: "QuantumCircuit") -> str:
+        """Render quantum circuit as a high-contrast, publication-quality PNG."""
+        try:
+            import matplotlib
+            matplotlib.use('Agg')
+            import matplotlib.pyplot as plt
+
+            # Premium light-on-dark style: crisp white bg, vivid gate colors
+            premium_style = {
+                'backgroundcolor': '#ffffff',
+                'textcolor':       '#1b1f23',
+                'subtextcolor':    '#586069',
+                'linecolor':       '#24292e',
+                'creglinecolor':   '#6f42c1',
+                'gatetextcolor':   '#ffffff',
+                'gatefacecolor':   '#4f46e5',       # Indigo gates
+                'barrierfacecolor':'#d1d5db',
+                'fontsize':        14,
+                'subfontsize':     11,
+                'displaycolor': {
+                    'h':    ('#6366f1', '#ffffff'),   # Indigo-500
+                    'x':    ('#ef4444', '#ffffff'),   # Red-500
+                    'y':    ('#22c55e', '#ffffff'),   # Green-500
+                    'z':    ('#3b82f6', '#ffffff'),   # Blue-500
+                    'cx':   ('#8b5cf6', '#ffffff'),   # Violet-500
+                    'cz':   ('#0ea5e9', '#ffffff'),   # Sky-500
+                    'rx':   ('#f97316', '#ffffff'),   # Orange-500
+                    'ry':   ('#14b8a6', '#ffffff'),   # Teal-500
+                    'rz':   ('#a855f7', '#ffffff'),   # Purple-500
+                    'swap': ('#ec4899', '#ffffff'),   # Pink-500
+                    'id':   ('#94a3b8', '#1e293b'),   # Slate
+                    'u':    ('#e11d48', '#ffffff'),   # Rose-600
+                    'measure': ('#0d9488', '#ffffff'), # Teal-600
+                    'reset': ('#64748b', '#ffffff'),  # Slate-500
+                    'target': ('#6366f1', '#ffffff'),
+                },
+            }
+
+            # Wider figure for deeper circuits
+            n_qubits = qc.num_qubits
+            fig_w = max(12, min(20, qc.depth() * 1.4))
+            fig_h = max(3, n_qubits * 0.7 + 1)
+
+            fig = qc.draw(
+                output='mpl',
+                style=premium_style,
+                fold=-1,                    # no folding — show full width
+                initial_state=True,
+            )
+            # Override figure size after draw
+            fig.set_size_inches(fig_w, fig_h)
+
+            buf = io.BytesIO()
+            fig.savefig(
+                buf, format='png', dpi=200,
+                bbox_inches='tight', pad_inches=0.15,
+                facecolor='#ffffff', edgecolor='none',
+            )
+            plt.close(fig)
+            buf.seek(0)
+            return base64.b64encode(buf.read()).decode('utf-8')
+
+        except Exception as e:
+            # Fallback: text circuit rendered as high-contrast PNG
+            try:
+                import matplotlib
+                matplotlib.use('Agg')
+                import matplotlib.pyplot as plt
+
+                text_repr = str(qc.draw(output='text'))
+                lines = text_repr.split('\n')
+                fig_h = max(3, len(lines) * 0.22 + 0.5)
+                fig, ax = plt.subplots(figsize=(14, fig_h), facecolor='#ffffff')
+                ax.set_facecolor('#ffffff')
+                ax.text(
+                    0.02, 0.95, text_repr,
+                    transform=ax.transAxes,
+                    fontfamily='monospace', fontsize=9, color='#1b1f23',
+                    verticalalignment='top',
+                )
+                ax.axis('off')
+                buf = io.BytesIO()
+                fig.savefig(
+                    buf, format='png', dpi=200,
+                    bbox_inches='tight', facecolor='#ffffff', edgecolor='none',
+                )
+                plt.close(fig)
+                buf.seek(0)
+                return base64.b64encode(buf.read()).decode('utf-8')
+            except Exception:
+                return None
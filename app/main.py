@@ -0,0 +1,574 @@
+"""
+Money Muling Detection Engine — FastAPI Application
+RIFT 2026 Hackathon | Graph Theory Track
+
+Multi-Agent Hybrid Classical-Quantum Financial Forensics Engine.
+"""
+
+import os
+
+# Pin BLAS/OpenMP pools to one thread before numpy/sklearn load — the agents
+# already run in parallel (threads or processes), nested pools only oversubscribe
+for _var in ("OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS", "OMP_NUM_THREADS"):
+    os.environ.setdefault(_var, "1")
+
+import time
+import json
+import uuid
+import hashlib
+import logging
+import numpy as np
+import orjson
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from pathlib import Path
+from dotenv import load_dotenv
+from fastapi import FastAPI, UploadFile, File, HTTPException, Request
+from fastapi.responses import HTMLResponse, ORJSONResponse, Response, StreamingResponse
+from fastapi.staticfiles import StaticFiles
+from fastapi.templating import Jinja2Templates
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from starlette.concurrency import run_in_threadpool
+
+from typing import Dict, Optional, Tuple
+
+
+def _dumps(obj) -> bytes:
+    # Same options as ORJSONResponse — NumPy scalars/arrays and non-str keys serialise as-is
+    return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+
+
+# Production tuning env vars
+MAX_GRAPH_VIZ_NODES = int(os.getenv("MAX_GRAPH_VIZ_NODES", "800"))   # cap nodes in response
+MAX_GRAPH_VIZ_EDGES = int(os.getenv("MAX_GRAPH_VIZ_EDGES", "2000"))  # cap edges in response
+GRAPH_VIZ_DEFER_EDGES = int(os.getenv("GRAPH_VIZ_DEFER_EDGES", "20000"))  # above: graph_data served lazily
+
+# Load .env before any agent imports (so GROQ_API_KEY is available)
+load_dotenv(Path(__file__).parent.parent / ".env")
+
+from app.utils.csv_parser import parse_csv
+from app.utils.graph_arrays import select_nodes
+from app.utils.state_store import AnalysisState, LATEST_SESSION, create_state_store
+from app.agents.graph_agent import GraphAgent
+from app.agents.ml_agent import MLAgent
+from app.agents.quantum_agent import QuantumAgent
+from app.agents.aggregator import AggregatorAgent
+from app.agents.disruption_engine import DisruptionEngine
+from app.agents.crime_team import CrimeTeam
+from app.agents.whatif_simulator import WhatIfSimulator
+from app.utils.agent_pool import (
+    process_pool_enabled, get_process_pool, shutdown_process_pool,
+    run_ml_agent, run_graph_quantum_agents,
+)
+
+# Logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger("muling_engine")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # AGENT_EXECUTOR=process workers outlive requests — stop them with the server
+    shutdown_process_pool()
+
+
+# App
+app = FastAPI(
+    title="Money Muling Detection Engine",
+    description="Hybrid Classical-ML-Quantum Financial Forensics System",
+    version="1.0.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
+)
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=["*"],
+    allow_credentials=False,
+    allow_methods=["*"],
+    allow_headers=["*"],
+)
+# graph_data + ring/account lists compress ~10× — gzip anything over 1 KB
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
+# Static files — prefer React build, fallback to legacy
+REACT_DIST = Path(__file__).parent.parent / "frontend" / "dist"
+STATIC_DIR = Path(__file__).parent / "static"
+
+if REACT_DIST.exists() and (REACT_DIST / "assets").exists():
+    app.mount("/assets", StaticFiles(directory=str(REACT_DIST / "assets")), name="assets")
+elif STATIC_DIR.exists():
+    app.mount("/static", StaticFiles(directory=str(STATIC_DIR)), name="static")
+
+# Per-session analysis state (in-memory, or Redis when REDIS_URL is set);
+# the session id travels in a cookie, cookie-less clients get the latest run
+state_store = create_state_store()
+SESSION_COOKIE = "rift_session"
+
+
+async def _load_state(request: Request) -> Optional[AnalysisState]:
+    session_id = request.cookies.get(SESSION_COOKIE)
+    state = await state_store.get(session_id) if session_id else None
+    if state is None:
+        state = await state_store.get(LATEST_SESSION)
+    return state
+
+
+def _analysis_state_id(analysis_id: str) -> str:
+    return f"analysis:{analysis_id}"
+
+
+async def _link_session(request: Request, response: Response, analysis_id: str):
+    # The analysis is stored once under its content hash (the deferred
+    # graph_data_url points there); the session and "latest" are links to it
+    state_id = _analysis_state_id(analysis_id)
+    session_id = request.cookies.get(SESSION_COOKIE) or uuid.uuid4().hex
+    await state_store.link(session_id, state_id)
+    await state_store.link(LATEST_SESSION, state_id)
+    response.set_cookie(SESSION_COOKIE, session_id, httponly=True, samesite="lax")
+
+
+def _hash_upload(fh, chunk_size: int = 1 << 20) -> str:
+    """blake2b of the spooled upload, read in chunks; leaves the handle rewound."""
+    fh.seek(0)
+    h = hashlib.blake2b(digest_size=16)
+    for chunk in iter(lambda: fh.read(chunk_size), b""):
+        h.update(chunk)
+    fh.seek(0)
+    return h.hexdigest()
+
+
+@app.head("/", include_in_schema=False)
+async def homepage_head():
+    """HEAD / — satisfies Render's port-detection health probe."""
+    return ORJSONResponse(content=None, status_code=200)
+
+
+@app.get("/", response_class=HTMLResponse)
+async def homepage():
+    """Serve the main application page (React build or legacy).
+    When deployed as a pure API backend (e.g. Render + Vercel split),
+    no static directory exists — return a friendly JSON status instead.
+    """
+    if REACT_DIST.exists():
+        index_path = REACT_DIST / "index.html"
+        return HTMLResponse(content=index_path.read_text(encoding="utf-8"))
+    if STATIC_DIR.exists() and (STATIC_DIR / "index.html").exists():
+        index_path = STATIC_DIR / "index.html"
+        return HTMLResponse(content=index_path.read_text(encoding="utf-8"))
+    # Pure API mode — no frontend bundled on this server
+    return ORJSONResponse(content={
+        "service": "Money Muling Detection Engine API",
+        "version": "1.0.0",
+        "status": "running",
+        "docs": "/docs",
+        "health": "/api/health",
+    })
+
+
+def _run_core_agents(G, df) -> Tuple[Dict, Dict, Dict]:
+    """
+    Agents 1-3 — blocking; call via run_in_threadpool.
+    ML runs alongside the graph → quantum chain: quantum needs the detected
+    rings, so it starts once GraphAgent returns and scores them in one pass.
+    """
+    logger.info("Running MLAgent in parallel with GraphAgent → QuantumAgent...")
+
+    if process_pool_enabled():
+        # AGENT_EXECUTOR=process — agents on separate cores; workers rebuild G from df
+        pool = get_process_pool()
+        f_ml = pool.submit(run_ml_agent, df)
+        graph_results, quantum_results = pool.submit(run_graph_quantum_agents, df).result()
+        ml_results = f_ml.result()
+    else:
+        with ThreadPoolExecutor(max_workers=1) as exe:
+            f_ml = exe.submit(lambda: MLAgent(G, df).run())
+            graph_results = GraphAgent(G, df).run()
+            quantum_results = QuantumAgent(G, graph_results["rings"]).run()
+            ml_results = f_ml.result()
+
+    return graph_results, ml_results, quantum_results
+
+
+@app.post("/api/analyze")
+async def analyze_csv(request: Request, file: UploadFile = File(...)):
+    """
+    Main analysis endpoint.
+    Accepts CSV upload, runs all 4 agents, returns unified results.
+    """
+    start_time = time.time()
+    
+    try:
+        # ── Step 1: Read & parse CSV ──
+        logger.info(f"Received file: {file.filename}")
+        # Starlette has already streamed the body into a spooled temp file
+        # (RAM up to 1 MB, then disk) — parse from that handle instead of
+        # copying the whole upload into a bytes object first
+        key = await run_in_threadpool(_hash_upload, file.file)
+        cached = await state_store.get(_analysis_state_id(key))
+        if cached is not None:
+            # Same CSV as an analysis the state store still holds — replay its
+            # result and point this session at it
+            logger.info("Analysis cache hit — returning stored result")
+            body = await run_in_threadpool(_dumps, cached.results)
+            response = Response(content=body, media_type="application/json")
+            await _link_session(request, response, key)
+            return response
+        
+        df, G, metadata = await run_in_threadpool(parse_csv, file.file)
+        logger.info(f"Parsed {metadata['total_transactions']} transactions, "
+                     f"{metadata['total_accounts']} accounts")
+        
+        # ── Steps 2-4: Run Agents 1-3 (ML ∥ graph → quantum, off the event loop) ──
+        graph_results, ml_results, quantum_results = await run_in_threadpool(_run_core_agents, G, df)
+
+        logger.info(f"Graph Agent found {len(graph_results['rings'])} rings, "
+                     f"{len(graph_results['suspicious_accounts'])} suspicious accounts")
+        logger.info(f"ML Agent scored {len(ml_results.get('ml_scores', {}))} accounts")
+        q_avail = quantum_results.get("quantum_available", False)
+        logger.info(f"Quantum Agent: available={q_avail}")
+        
+        # ── Step 5: Run Agent 4 — Aggregator ──
+        logger.info("Running Aggregator Agent...")
+        aggregator = AggregatorAgent(
+            graph_results=graph_results,
+            ml_results=ml_results,
+            quantum_results=quantum_results,
+            total_accounts=metadata["total_accounts"],
+            processing_start_time=start_time
+        )
+        final_output = await run_in_threadpool(aggregator.run)
+        
+        # ── Step 6: Run Disruption Engine ──
+        logger.info("Running Disruption Engine...")
+        disruption = DisruptionEngine(
+            G=G,
+            fraud_rings=final_output["fraud_rings"],
+            suspicious_accounts=final_output["suspicious_accounts"],
+            quantum_results=quantum_results,
+        )
+        disruption_results = await run_in_threadpool(disruption.run)
+        final_output["disruption"] = disruption_results
+        logger.info(f"Disruption Engine: {len(disruption_results['strategies'])} strategies, "
+                     f"{disruption_results['global_summary']['unique_critical_nodes']} critical nodes")
+        
+        # ── Step 7: Run Crime Team ──
+        logger.info("Running Crime Team...")
+        crime_team = CrimeTeam(
+            graph_results=graph_results,
+            ml_results=ml_results,
+            quantum_results=quantum_results,
+            aggregated=final_output,
+            disruption=disruption_results,
+        )
+        crime_team_results = await run_in_threadpool(crime_team.run)
+        final_output["crime_team"] = crime_team_results
+        logger.info("Crime Team report generated")
+        
+        # ── Step 8: Build graph data for visualization ──
+        if G.number_of_edges() > GRAPH_VIZ_DEFER_EDGES:
+            # Large graph — return the analysis now; viz is built on first GET
+            final_output["graph_data"] = None
+            final_output["graph_data_url"] = f"/api/analyze/{key}/graph"
+        else:
+            final_output["graph_data"] = await run_in_threadpool(_build_graph_viz_data, G, final_output)
+        final_output["metadata"] = metadata
+        
+        elapsed = round(time.time() - start_time, 2)
+        logger.info(f"Analysis complete in {elapsed}s — "
+                     f"{final_output['summary']['suspicious_accounts_flagged']} suspicious, "
+                     f"{final_output['summary']['fraud_rings_detected']} rings")
+        
+        body = await run_in_threadpool(_dumps, final_output)
+        # Store for download / What-If (and re-uploads of the same CSV)
+        await state_store.set(_analysis_state_id(key), AnalysisState(final_output, G, df))
+        response = Response(content=body, media_type="application/json")
+        await _link_session(request, response, key)
+        return response
+    
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Analysis failed: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Analysis error: {str(e)}")
+
+
+@app.get("/api/analyze/{analysis_id}/graph")
+async def analysis_graph(analysis_id: str):
+    """Deferred graph_data for a large analysis — built on first request, then memoised."""
+    state_id = _analysis_state_id(analysis_id)
+    state = await state_store.get(state_id)
+    if state is None or state.graph is None:
+        raise HTTPException(status_code=404, detail="Analysis not found or expired. Upload the CSV again.")
+    if state.results.get("graph_data") is None:
+        state.results["graph_data"] = await run_in_threadpool(
+            _build_graph_viz_data, state.graph, state.results)
+        await state_store.set(state_id, state)  # persist the memo (no-op copy for the in-memory store)
+    return ORJSONResponse(content=state.results["graph_data"])
+
+
+@app.get("/api/download")
+async def download_json(request: Request):
+    """Download the latest analysis results as JSON file."""
+    state = await _load_state(request)
+    if state is None or not state.results:
+        raise HTTPException(status_code=404, detail="No analysis results available. Upload a CSV first.")
+    
+    # Stream the clean output (exact required format) section by section —
+    # bytes start flowing at once and no full copy of the payload is built
+    results = state.results
+    summary = {
+        "total_accounts_analyzed": results["summary"]["total_accounts_analyzed"],
+        "suspicious_accounts_flagged": results["summary"]["suspicious_accounts_flagged"],
+        "fraud_rings_detected": results["summary"]["fraud_rings_detected"],
+        "processing_time_seconds": results["summary"]["processing_time_seconds"]
+    }
+
+    def _gen():
+        yield b'{"suspicious_accounts":['
+        yield from _json_array_items(
+            {
+                "account_id": sa["account_id"],
+                "suspicion_score": sa["suspicion_score"],
+                "detected_patterns": sa["detected_patterns"],
+                "ring_id": sa["ring_id"]
+            }
+            for sa in results.get("suspicious_accounts", [])
+        )
+        yield b'],"fraud_rings":['
+        yield from _json_array_items(
+            {
+                "ring_id": ring["ring_id"],
+                "member_accounts": ring["member_accounts"],
+                "pattern_type": ring["pattern_type"],
+                "risk_score": ring["risk_score"]
+            }
+            for ring in results.get("fraud_rings", [])
+        )
+        yield b'],"summary":' + _dumps(summary) + b'}'
+
+    return StreamingResponse(
+        _gen(),
+        media_type="application/json",
+        headers={
+            "Content-Disposition": "attachment; filename=fraud_analysis_results.json"
+        }
+    )
+
+
+def _json_array_items(items, batch: int = 256):
+    """Yield comma-joined JSON array elements, one chunk per `batch` items."""
+    buf = []
+    first = True
+    for item in items:
+        buf.append(_dumps(item))
+        if len(buf) >= batch:
+            yield (b"" if first else b",") + b",".join(buf)
+            first = False
+            buf = []
+    if buf:
+        yield (b"" if first else b",") + b",".join(buf)
+
+
+@app.get("/api/health")
+async def health_check():
+    """Health check endpoint."""
+    return {"status": "healthy", "engine": "Money Muling Detection Engine v1.0"}
+
+
+@app.post("/api/webhook/n8n")
+async def n8n_webhook(request: Request):
+    """
+    Webhook endpoint for n8n integration.
+    n8n can trigger analysis and receive results.
+    """
+    body = await request.json()
+    action = body.get("action", "check_status")
+    state = await _load_state(request)
+    latest_results = state.results if state is not None else {}
+    
+    if action == "get_results" and latest_results:
+        return ORJSONResponse(content={
+            "status": "success",
+            "summary": latest_results.get("summary", {}),
+            "suspicious_accounts": latest_results.get("suspicious_accounts", []),
+            "fraud_rings": latest_results.get("fraud_rings", []),
+        })
+    
+    return ORJSONResponse(content={
+        "status": "received",
+        "message": "n8n webhook processed",
+        "action": action,
+        "latest_results_available": bool(latest_results),
+        "summary": latest_results.get("summary") if latest_results else None
+    })
+
+
+@app.get("/n8n_workflow.json")
+async def get_n8n_workflow():
+    """Serve the n8n importable workflow JSON."""
+    workflow_path = Path(__file__).parent.parent / "n8n_workflow.json"
+    if not workflow_path.exists():
+        raise HTTPException(status_code=404, detail="Workflow file not found")
+    content = json.loads(workflow_path.read_text(encoding="utf-8"))
+    return ORJSONResponse(content=content, headers={
+        "Content-Disposition": "attachment; filename=mulingnet_n8n_workflow.json"
+    })
+
+
+@app.post("/api/whatif")
+async def whatif_simulate(request: Request):
+    """
+    What-If Simulator endpoint.
+    Accepts a list of nodes to remove and returns impact analysis.
+    """
+    state = await _load_state(request)
+    if state is None or not state.graph or not state.results:
+        raise HTTPException(status_code=400, detail="No analysis results. Upload a CSV first.")
+    
+    body = await request.json()
+    nodes_to_remove = body.get("nodes", [])
+    
+    if not nodes_to_remove:
+        raise HTTPException(status_code=400, detail="No nodes specified. Provide 'nodes' array.")
+    
+    simulator = WhatIfSimulator(
+        G=state.graph,
+        df=state.df,
+        fraud_rings=state.results.get("fraud_rings", []),
+        suspicious_accounts=state.results.get("suspicious_accounts", []),
+    )
+    
+    result = await run_in_threadpool(simulator.simulate, nodes_to_remove)
+    return ORJSONResponse(content=result)
+    
+def _build_graph_viz_data(G, results: Dict) -> Dict:
+    """Build graph data in vis.js compatible format.
+
+    For large graphs (10K+ transactions) we cap the visualisation to
+    MAX_GRAPH_VIZ_NODES / MAX_GRAPH_VIZ_EDGES to avoid generating a
+    multi-megabyte JSON payload that would time-out on Render free tier.
+
+    Priority: suspicious nodes > their direct neighbours > benign nodes.
+    """
+    suspicious_map = {
+        sa["account_id"]: sa for sa in results.get("suspicious_accounts", [])
+    }
+    
+    # Ring membership lookup
+    ring_colors = {}
+    color_palette = [
+        "#ff4444", "#ff8800", "#ffcc00", "#44ff44", 
+        "#4488ff", "#aa44ff", "#ff44aa", "#44ffcc",
+        "#ff6644", "#66ccff", "#cc44ff", "#ffaa44"
+    ]
+    for idx, ring in enumerate(results.get("fraud_rings", [])):
+        color = color_palette[idx % len(color_palette)]
+        for member in ring["member_accounts"]:
+            ring_colors[member] = color
+
+    # ── Build the node subset (suspicious first, then neighbours) ──
+    # Neighbour expansion runs over the int-indexed CSR/CSC arrays from
+    # parse_csv (Numba-compiled when available); highest-scored seeds first
+    arrays = G.graph["arrays"]
+    seeds = arrays.index.get_indexer(
+        [sa["account_id"] for sa in results.get("suspicious_accounts", [])])
+    seed_scores = np.array(
+        [sa.get("suspicion_score", 0) for sa in results.get("suspicious_accounts", [])],
+        dtype=np.float64)
+    valid = seeds >= 0
+    seeds, seed_scores = seeds[valid], seed_scores[valid]
+    include_mask = select_nodes(arrays, seeds, MAX_GRAPH_VIZ_NODES).astype(bool)
+
+    # ── Node styling, vectorised over the included ids ──
+    suspicious_mask = np.zeros(arrays.n_nodes, dtype=bool)
+    suspicious_mask[seeds] = True
+    score_by_id = np.zeros(arrays.n_nodes)
+    score_by_id[seeds] = seed_scores
+
+    sel = np.flatnonzero(include_mask)
+    sel_susp = suspicious_mask[sel]
+    sel_score = score_by_id[sel]
+    # tier 3: score >= 70, 2: >= 40, 1: any other suspicious, 0: benign
+    tier = np.select([sel_susp & (sel_score >= 70), sel_susp & (sel_score >= 40), sel_susp],
+                     [3, 2, 1], 0)
+    sizes = np.select([tier == 3, tier == 2, tier == 1],
+                      [25 + sel_score * 0.3, 20 + sel_score * 0.2, 18], 12)
+    tier_colors = ("#336699", "#ffcc00", "#ff8800", "#ff2222")
+
+    nodes = []
+    for node, t, size in zip(arrays.nodes[sel].tolist(), tier.tolist(), sizes.tolist()):
+        is_suspicious = t > 0
+        node_data = G.nodes[node]
+        
+        sa = suspicious_map.get(node, {})
+        score = sa.get("suspicion_score", 0)
+        patterns = sa.get("detected_patterns", [])
+        ring_id = sa.get("ring_id", None)
+        color = ring_colors.get(node, tier_colors[t]) if is_suspicious else tier_colors[0]
+        
+        nodes.append({
+            "id": node,
+            "label": node,
+            "color": {
+                "background": color,
+                "border": "#ffffff" if is_suspicious else "#224466",
+                "highlight": {"background": "#ffffff", "border": color}
+            },
+            "size": size,
+            "borderWidth": t + 1,
+            "shape": "dot",
+            "title": (
+                f"<b>{node}</b><br>"
+                f"Score: {score}<br>"
+                f"Patterns: {', '.join(patterns) if patterns else 'None'}<br>"
+                f"Ring: {ring_id or 'N/A'}<br>"
+                f"Sent: {node_data.get('total_sent', 0):.2f}<br>"
+                f"Received: {node_data.get('total_received', 0):.2f}<br>"
+                f"Transactions: {node_data.get('tx_count_total', 0)}"
+            ),
+            "suspicious": is_suspicious,
+            "score": score,
+            "patterns": patterns,
+            "ring_id": ring_id
+        })
+    
+    # Edge filter: both endpoints included, first MAX_GRAPH_VIZ_EDGES in CSR order
+    keep = np.flatnonzero(include_mask[arrays.edge_src] & include_mask[arrays.indices_out])
+    keep = keep[:MAX_GRAPH_VIZ_EDGES]
+    u_ids, v_ids = arrays.edge_src[keep], arrays.indices_out[keep]
+    amounts = arrays.edge_amount[keep]
+    suspicious_edge = suspicious_mask[u_ids] & suspicious_mask[v_ids]
+    widths = np.where(suspicious_edge, np.clip(amounts / 5000, 1, 5), 1)
+
+    edges = [
+        {
+            "from": u,
+            "to": v,
+            "arrows": "to",
+            "label": f"${amount:,.0f}" if amount > 0 else "",
+            "title": f"{u} → {v}<br>Amount: ${amount:,.2f}<br>Transactions: {tx_count}",
+            "color": {
+                "color": "#ff4444" if is_suspicious_edge else "#556677",
+                "opacity": 0.8 if is_suspicious_edge else 0.4
+            },
+            "width": width,
+            "smooth": {"type": "curvedCW", "roundness": 0.2}
+        }
+        for u, v, amount, tx_count, is_suspicious_edge, width in zip(
+            arrays.nodes[u_ids].tolist(), arrays.nodes[v_ids].tolist(), amounts.tolist(),
+            arrays.edge_tx_count[keep].tolist(), suspicious_edge.tolist(), widths.tolist())
+    ]
+    
+    total_nodes = len(G.nodes())
+    total_edges = G.number_of_edges()
+    return {
+        "nodes": nodes,
+        "edges": edges,
+        "truncated": total_nodes > MAX_GRAPH_VIZ_NODES or total_edges > MAX_GRAPH_VIZ_EDGES,
+        "total_nodes": total_nodes,
+        "total_edges": total_edges,
+    }
+
+
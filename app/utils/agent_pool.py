@@ -0,0 +1,67 @@
+"""
+Agent Pool — optional multi-process execution for the CPU-bound agents.
+GraphAgent / MLAgent / QuantumAgent are pure-Python + NetworkX work that holds
+the GIL, so under threads they share one core. With AGENT_EXECUTOR=process
+they run in a persistent forkserver pool instead.
+
+Workers receive the cleaned DataFrame (cheap to pickle) and rebuild the graph
+locally, rather than pickling the full nx.DiGraph with its per-edge
+transaction lists. The graph → quantum chain is one task, so each request
+builds the graph twice (once per worker) instead of once; that only pays off
+on multi-core hosts. Threads stay the default for single-core hosts.
+"""
+
+import os
+import threading
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Optional, Tuple
+
+import pandas as pd
+
+AGENT_EXECUTOR = os.getenv("AGENT_EXECUTOR", "thread").strip().lower()
+AGENT_POOL_WORKERS = int(os.getenv("AGENT_POOL_WORKERS", "3"))
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def process_pool_enabled() -> bool:
+    return AGENT_EXECUTOR == "process"
+
+
+def get_process_pool() -> ProcessPoolExecutor:
+    """Lazily create the shared pool (forkserver where supported, spawn otherwise)."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            method = "forkserver" if "forkserver" in mp.get_all_start_methods() else "spawn"
+            _pool = ProcessPoolExecutor(max_workers=AGENT_POOL_WORKERS,
+                                        mp_context=mp.get_context(method))
+        return _pool
+
+
+def shutdown_process_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+
+
+# ── Top-level (picklable) worker entry points ──
+
+def run_ml_agent(df: pd.DataFrame) -> Dict:
+    from app.utils.csv_parser import build_graph
+    from app.agents.ml_agent import MLAgent
+    return MLAgent(build_graph(df), df).run()
+
+
+def run_graph_quantum_agents(df: pd.DataFrame) -> Tuple[Dict, Dict]:
+    """GraphAgent then QuantumAgent on the detected rings, sharing one rebuilt graph."""
+    from app.utils.csv_parser import build_graph
+    from app.agents.graph_agent import GraphAgent
+    from app.agents.quantum_agent import QuantumAgent
+    G = build_graph(df)
+    graph_results = GraphAgent(G, df).run()
+    return graph_results, QuantumAgent(G, graph_results["rings"]).run()
@@ -0,0 +1,147 @@
+"""
+CSV Parser Utility — FAST edition
+Parses uploaded CSV files into structured transaction data and builds NetworkX graph.
+Uses vectorised pandas ops instead of iterrows for 10K+ row performance.
+"""
+
+import pandas as pd
+import numpy as np
+import networkx as nx
+from io import BytesIO
+from typing import BinaryIO, Tuple, Dict, Union
+
+from app.utils.graph_arrays import GraphArrays, TransactionColumns, EdgeTransactions
+
+# Optional: pandas' Arrow CSV engine parses raw bytes with a multi-threaded tokenizer
+try:
+    import pyarrow  # noqa: F401
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+
+REQUIRED_COLUMNS = ["transaction_id", "sender_id", "receiver_id", "amount", "timestamp"]
+
+
+def _read_csv(file_content: Union[bytes, str, BinaryIO]) -> pd.DataFrame:
+    """Read CSV bytes or a binary file handle — no decode-to-str round trip; Arrow engine when installed."""
+    if isinstance(file_content, str):
+        file_content = file_content.encode("utf-8")
+    if isinstance(file_content, bytes):
+        file_content = BytesIO(file_content)
+    if not PYARROW_AVAILABLE:
+        return pd.read_csv(file_content, engine="c")  # raises UnicodeDecodeError on non-UTF-8 input
+    df = pd.read_csv(file_content, engine="pyarrow")
+    # Arrow keeps undecodable text as a binary column of bytes values instead of
+    # failing; reject it like the C engine so the upload gets a 400, not a 500
+    for col in df.columns[df.dtypes == object]:
+        if pd.api.types.infer_dtype(df[col], skipna=True) == "bytes":
+            raise ValueError(f"Column '{col}' is not valid UTF-8 text")
+    return df
+
+
+def parse_csv(file_content: Union[bytes, str, BinaryIO]) -> Tuple[pd.DataFrame, nx.DiGraph, Dict]:
+    """
+    Parse CSV content into a DataFrame and build a directed transaction graph.
+    Accepts raw bytes, text, or a binary file object (e.g. an upload's spooled temp file).
+    Optimised: vectorised groupby instead of iterrows / per-node filtering.
+    """
+    df = _read_csv(file_content)
+
+    # Normalise column names
+    df.columns = [col.strip().lower().replace(" ", "_") for col in df.columns]
+
+    missing = [col for col in REQUIRED_COLUMNS if col not in df.columns]
+    if missing:
+        raise ValueError(f"Missing required columns: {missing}")
+
+    df["amount"] = pd.to_numeric(df["amount"], errors="coerce")
+    df["timestamp"] = pd.to_datetime(df["timestamp"], errors="coerce", format="mixed")
+    df = df.dropna(subset=["sender_id", "receiver_id", "amount", "timestamp"])
+
+    G = build_graph(df)
+
+    metadata = {
+        "total_transactions": len(df),
+        "total_accounts": G.number_of_nodes(),
+        "total_edges": G.number_of_edges(),
+        "date_range": {
+            "start": str(df["timestamp"].min()),
+            "end": str(df["timestamp"].max())
+        }
+    }
+
+    return df, G, metadata
+
+
+def build_graph(df: pd.DataFrame) -> nx.DiGraph:
+    """
+    Build the directed transaction graph (edge transactions + node stats) from a cleaned DataFrame.
+    Split out of parse_csv so process-pool workers can rebuild G from the DataFrame alone.
+    """
+    G = nx.DiGraph()
+
+    # Factorise accounts once (first-appearance order); every per-node
+    # statistic below is a bincount over these int codes — no groupby/sort
+    n_rows = len(df)
+    codes, all_accounts = pd.factorize(
+        np.concatenate([df["sender_id"].to_numpy(), df["receiver_id"].to_numpy()]))
+    src, dst = codes[:n_rows], codes[n_rows:]
+    n = len(all_accounts)
+    amount = df["amount"].to_numpy(dtype=np.float64)
+    G.add_nodes_from(all_accounts.tolist())
+
+    # One edge per (sender, receiver) run in the CSR arrays; each edge's
+    # transaction dicts are materialised lazily, only if a consumer reads them
+    arrays = GraphArrays(all_accounts, src, dst, amount)
+    G.graph["arrays"] = arrays
+    tx_cols = TransactionColumns(df, arrays.tx_order)
+    tx_bounds = arrays.tx_indptr.tolist()
+    G.add_edges_from(
+        (sender, receiver, {"total_amount": total, "tx_count": count,
+                            "transactions": EdgeTransactions(tx_cols, tx_bounds[e], tx_bounds[e + 1])})
+        for e, (sender, receiver, total, count) in enumerate(zip(
+            arrays.nodes[arrays.edge_src].tolist(), arrays.nodes[arrays.indices_out].tolist(),
+            arrays.edge_amount.tolist(), arrays.edge_tx_count.tolist()))
+    )
+
+    # ── Vectorised node-level statistics ──
+    total_sent = np.bincount(src, weights=amount, minlength=n)
+    total_recv = np.bincount(dst, weights=amount, minlength=n)
+    tx_sent = np.bincount(src, minlength=n)
+    tx_recv = np.bincount(dst, minlength=n)
+
+    # Temporal stats over each account's combined (sent + received) timeline:
+    # sort (account, time) event pairs, diff neighbours within an account
+    ts_ns = df["timestamp"].dt.as_unit("ns").array.asi8
+    event_acc = codes
+    event_ts = np.concatenate([ts_ns, ts_ns])
+    order = np.lexsort((event_ts, event_acc))
+    event_acc, event_ts = event_acc[order], event_ts[order]
+    same = event_acc[1:] == event_acc[:-1]
+    gap_acc = event_acc[1:][same]
+    gap_s = np.diff(event_ts)[same] / 1e9
+    gap_count = np.bincount(gap_acc, minlength=n)
+    avg_gap = np.full(n, np.inf)
+    np.divide(np.bincount(gap_acc, weights=gap_s, minlength=n), gap_count,
+              out=avg_gap, where=gap_count > 0)
+    min_gap = np.full(n, np.inf)
+    np.minimum.at(min_gap, gap_acc, gap_s)
+
+    nx.set_node_attributes(G, {
+        node: {
+            "total_sent": ts, "total_received": tr,
+            "tx_count_sent": cs, "tx_count_recv": cr, "tx_count_total": cs + cr,
+            "in_degree": din, "out_degree": dout,
+            "avg_time_gap": ag, "min_time_gap": mg,
+        }
+        for node, ts, tr, cs, cr, din, dout, ag, mg in zip(
+            all_accounts.tolist(),
+            total_sent.tolist(), total_recv.tolist(),
+            tx_sent.tolist(), tx_recv.tolist(),
+            np.diff(arrays.indptr_in).tolist(), np.diff(arrays.indptr_out).tolist(),
+            avg_gap.tolist(), min_gap.tolist(),
+        )
+    })
+
+    return G
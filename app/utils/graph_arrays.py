@@ -0,0 +1,213 @@
+"""
+Graph Arrays — structure-of-arrays view of the transaction graph.
+Accounts are factorised to int32 ids; edges live in CSR (out) / CSC (in)
+index arrays with per-edge total_amount / tx_count columns, so neighbour
+expansion and edge filtering are array slices instead of NetworkX
+dict-of-dict walks. Built once in parse_csv and attached as G.graph["arrays"].
+"""
+
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+from collections.abc import Sequence
+from typing import List, Optional
+
+# Optional: Numba JIT for the neighbour-expansion loop (vectorised NumPy fallback)
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+class GraphArrays:
+    """Int-indexed CSR/CSC adjacency of the parsed graph (a snapshot — not updated by G.copy() edits)."""
+
+    __slots__ = ("nodes", "index", "adjacency", "indptr_out", "indices_out",
+                 "indptr_in", "indices_in", "edge_src", "edge_amount", "edge_tx_count",
+                 "tx_order", "tx_indptr")
+
+    def __init__(self, nodes: np.ndarray, src: np.ndarray, dst: np.ndarray, amount: np.ndarray):
+        n = len(nodes)
+        self.nodes = nodes                     # int id -> account id
+        self.index = pd.Index(nodes)           # account id -> int id
+
+        # Collapse parallel transactions into one edge per (src, dst); np.unique
+        # sorts the keys, which is exactly CSR order (row-major, cols ascending)
+        key = src.astype(np.int64) * n + dst
+        uniq, inv = np.unique(key, return_inverse=True)
+        self.edge_src = (uniq // n).astype(np.int32)
+        self.indices_out = (uniq % n).astype(np.int32)
+        self.edge_amount = np.bincount(inv, weights=amount, minlength=len(uniq))
+        self.edge_tx_count = np.bincount(inv, minlength=len(uniq))
+        # Transaction rows grouped by edge (stable — CSV order within an edge):
+        # edge e owns rows tx_order[tx_indptr[e]:tx_indptr[e + 1]]
+        self.tx_order = np.argsort(inv, kind="stable")
+        self.tx_indptr = np.zeros(len(uniq) + 1, dtype=np.int64)
+        np.cumsum(self.edge_tx_count, out=self.tx_indptr[1:])
+        self.indptr_out = np.zeros(n + 1, dtype=np.int32)
+        np.cumsum(np.bincount(self.edge_src, minlength=n), out=self.indptr_out[1:])
+
+        self.adjacency = sp.csr_matrix(
+            (self.edge_amount, self.indices_out, self.indptr_out), shape=(n, n))
+        csc = self.adjacency.tocsc()
+        self.indptr_in = csc.indptr.astype(np.int32)
+        self.indices_in = csc.indices.astype(np.int32)
+
+    @property
+    def n_nodes(self) -> int:
+        return len(self.nodes)
+
+    @property
+    def n_edges(self) -> int:
+        return len(self.indices_out)
+
+    def successors(self, i: int) -> np.ndarray:
+        return self.indices_out[self.indptr_out[i]:self.indptr_out[i + 1]]
+
+    def predecessors(self, i: int) -> np.ndarray:
+        return self.indices_in[self.indptr_in[i]:self.indptr_in[i + 1]]
+
+
+def _select_nodes_loop(indptr_out, indices_out, indptr_in, indices_in, seeds, cap):
+    """uint8 include-mask: seeds, then their predecessors/successors, then any node — up to cap."""
+    n = indptr_out.shape[0] - 1
+    mask = np.zeros(n, np.uint8)
+    count = 0
+    for s in seeds:
+        if mask[s] == 0:
+            mask[s] = 1
+            count += 1
+    for s in seeds:
+        if count >= cap:
+            break
+        for k in range(indptr_in[s], indptr_in[s + 1]):
+            v = indices_in[k]
+            if mask[v] == 0:
+                mask[v] = 1
+                count += 1
+                if count >= cap:
+                    break
+        for k in range(indptr_out[s], indptr_out[s + 1]):
+            if count >= cap:
+                break
+            v = indices_out[k]
+            if mask[v] == 0:
+                mask[v] = 1
+                count += 1
+    for v in range(n):
+        if count >= cap:
+            break
+        if mask[v] == 0:
+            mask[v] = 1
+            count += 1
+    return mask
+
+
+def _select_nodes_vectorised(indptr_out, indices_out, indptr_in, indices_in, seeds, cap):
+    """
+    Same mask as the loop, with whole-array ops. Every (seed, neighbour) slot
+    gets the key (seed rank, position in preds-then-succs); a neighbour's
+    first visit is its minimum key, so sorting by it reproduces the visit order.
+    """
+    n = indptr_out.shape[0] - 1
+    mask = np.zeros(n, np.uint8)
+    mask[seeds] = 1
+    count = int(mask.sum())
+
+    if 0 < count < cap:
+        rank = np.full(n, -1, np.int64)
+        rank[seeds] = np.arange(len(seeds))
+        in_deg, out_deg = np.diff(indptr_in), np.diff(indptr_out)
+        in_owner = np.repeat(np.arange(n), in_deg)
+        out_owner = np.repeat(np.arange(n), out_deg)
+        owner = np.concatenate((in_owner, out_owner))
+        nbr = np.concatenate((indices_in, indices_out))
+        pos = np.concatenate((np.arange(len(indices_in)) - indptr_in[in_owner],
+                              np.arange(len(indices_out)) - indptr_out[out_owner] + in_deg[out_owner]))
+
+        slot = (rank[owner] >= 0) & (mask[nbr] == 0)
+        stride = int(in_deg.max(initial=0) + out_deg.max(initial=0)) + 1
+        key = rank[owner[slot]] * stride + pos[slot]
+        first = np.full(n, np.iinfo(np.int64).max)
+        np.minimum.at(first, nbr[slot], key)
+        reached = np.flatnonzero(first < np.iinfo(np.int64).max)
+        take = reached[np.argsort(first[reached], kind="stable")][:cap - count]
+        mask[take] = 1
+        count += len(take)
+
+    if count < cap:
+        mask[np.flatnonzero(mask == 0)[:cap - count]] = 1
+    return mask
+
+
+# Compiled loop when Numba is installed (early exit at cap), array ops otherwise
+_select_nodes = njit(cache=True)(_select_nodes_loop) if NUMBA_AVAILABLE else _select_nodes_vectorised
+
+
+def select_nodes(arrays: "GraphArrays", seeds: np.ndarray, cap: int) -> np.ndarray:
+    """Viz node subset as a uint8 mask over arrays.nodes (seeds are always included)."""
+    return _select_nodes(arrays.indptr_out, arrays.indices_out, arrays.indptr_in,
+                         arrays.indices_in, seeds.astype(np.int32), cap)
+
+
+class TransactionColumns:
+    """Transaction columns reordered so every edge's transactions form one contiguous run."""
+
+    __slots__ = ("transaction_id", "amount", "timestamp", "_timestamp_str")
+
+    def __init__(self, df: pd.DataFrame, order: np.ndarray):
+        self.transaction_id = df["transaction_id"].to_numpy()[order]
+        self.amount = df["amount"].to_numpy(dtype=np.float64)[order]
+        self.timestamp = df["timestamp"].array[order]
+        self._timestamp_str: Optional[List[str]] = None
+
+    def timestamp_str(self) -> List[str]:
+        # str(Timestamp) per row, as the old per-edge dicts stored — built on first read only
+        if self._timestamp_str is None:
+            self._timestamp_str = [str(t) for t in self.timestamp]
+        return self._timestamp_str
+
+
+class EdgeTransactions(Sequence):
+    """Lazy list of one edge's {"transaction_id", "amount", "timestamp"} dicts."""
+
+    __slots__ = ("_cols", "_start", "_stop")
+
+    def __init__(self, cols: TransactionColumns, start: int, stop: int):
+        self._cols = cols
+        self._start = start
+        self._stop = stop
+
+    def __len__(self) -> int:
+        return self._stop - self._start
+
+    def __iter__(self):
+        a, b = self._start, self._stop
+        cols = self._cols
+        for tx_id, amount, ts in zip(cols.transaction_id[a:b].tolist(),
+                                     cols.amount[a:b].tolist(),
+                                     cols.timestamp_str()[a:b]):
+            yield {"transaction_id": tx_id, "amount": amount, "timestamp": ts}
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return list(self)[i]
+        n = len(self)
+        if i < 0:
+            i += n
+        if not 0 <= i < n:
+            raise IndexError("transaction index out of range")
+        j = self._start + i
+        return next(iter(EdgeTransactions(self._cols, j, j + 1)))
+
+    # Immutable view over shared columns: copies (G.copy(), to_undirected()'s
+    # deepcopy) reuse it instead of cloning the whole column set per edge
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __repr__(self) -> str:
+        return f"EdgeTransactions({list(self)!r})"
@@ -0,0 +1,143 @@
+"""
+State Store — per-session analysis state (results, graph, DataFrame).
+Replaces the latest_* module globals so /api/download, /api/whatif and the
+n8n webhook read the analysis that belongs to the caller.
+
+Each analysis is stored once under its own key; sessions and "latest" are
+links (key → analysis key) pointing at it.
+
+  • MemoryStateStore — in-process LRU (default; single worker / dev)
+  • RedisStateStore  — shared across workers when REDIS_URL is set. Only the
+    results and the cleaned DataFrame are pickled; the graph is rebuilt from
+    the DataFrame on first load and memoised per analysis in the worker, so
+    the nx.DiGraph never goes over the wire.
+"""
+
+import os
+import pickle
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional
+
+import networkx as nx
+import pandas as pd
+from starlette.concurrency import run_in_threadpool
+
+# Optional: redis-py's asyncio client for the shared store
+try:
+    import redis.asyncio as redis_asyncio
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+logger = logging.getLogger("state_store")
+
+LATEST_SESSION = "latest"  # fallback key for cookie-less clients (scripts, n8n)
+
+
+class AnalysisState:
+    """One analysis: the final output plus the graph / DataFrame What-If needs."""
+
+    __slots__ = ("results", "graph", "df")
+
+    def __init__(self, results: Dict, graph: Optional[nx.DiGraph], df: Optional[pd.DataFrame]):
+        self.results = results
+        self.graph = graph
+        self.df = df
+
+
+MAX_LINKS = 4096  # session → analysis pointers are just strings
+
+
+def _lru_put(cache: OrderedDict, key, value, limit: int):
+    cache[key] = value
+    cache.move_to_end(key)
+    while len(cache) > limit:
+        cache.popitem(last=False)
+
+
+class MemoryStateStore:
+    """In-process analysis key → AnalysisState map (LRU-bounded) plus session links."""
+
+    def __init__(self, max_sessions: int = 16):
+        self.max_sessions = max_sessions
+        self._states: "OrderedDict[str, AnalysisState]" = OrderedDict()
+        self._links: "OrderedDict[str, str]" = OrderedDict()
+
+    async def get(self, key: str) -> Optional[AnalysisState]:
+        target = self._links.get(key, key)
+        state = self._states.get(target)
+        if state is not None:
+            self._states.move_to_end(target)
+        return state
+
+    async def set(self, key: str, state: AnalysisState):
+        _lru_put(self._states, key, state, self.max_sessions)
+
+    async def link(self, key: str, target: str):
+        """Make get(key) return the state stored under target."""
+        _lru_put(self._links, key, target, MAX_LINKS)
+
+
+class RedisStateStore:
+    """Redis-backed store shared by every worker; entries expire after ttl seconds."""
+
+    KEY_PREFIX = "rift:state:"
+    LINK_PREFIX = "rift:link:"
+
+    def __init__(self, url: str, ttl: int = 3600, max_graphs: int = 16):
+        self.ttl = ttl
+        self.max_graphs = max_graphs
+        self._client = redis_asyncio.from_url(url)
+        # Graphs rebuilt in this worker, by analysis key — an analysis key is
+        # content-addressed, so its graph never changes
+        self._graphs: "OrderedDict[str, nx.DiGraph]" = OrderedDict()
+        self._graphs_lock = threading.Lock()  # _load runs on threadpool workers
+
+    async def get(self, key: str) -> Optional[AnalysisState]:
+        target = await self._client.get(self.LINK_PREFIX + key)
+        target = target.decode() if target is not None else key
+        payload = await self._client.get(self.KEY_PREFIX + target)
+        if payload is None:
+            return None
+        return await run_in_threadpool(self._load, target, payload)
+
+    async def set(self, key: str, state: AnalysisState):
+        payload = await run_in_threadpool(
+            pickle.dumps, {"results": state.results, "df": state.df}, pickle.HIGHEST_PROTOCOL)
+        await self._client.set(self.KEY_PREFIX + key, payload, ex=self.ttl)
+        if state.graph is not None:
+            with self._graphs_lock:
+                _lru_put(self._graphs, key, state.graph, self.max_graphs)
+
+    async def link(self, key: str, target: str):
+        """Make get(key) return the state stored under target."""
+        await self._client.set(self.LINK_PREFIX + key, target, ex=self.ttl)
+
+    def _load(self, key: str, payload: bytes) -> AnalysisState:
+        data = pickle.loads(payload)
+        df = data["df"]
+        with self._graphs_lock:
+            graph = self._graphs.get(key)
+            if graph is not None:
+                self._graphs.move_to_end(key)
+        if graph is None and df is not None:
+            from app.utils.csv_parser import build_graph
+            graph = build_graph(df)
+            with self._graphs_lock:
+                _lru_put(self._graphs, key, graph, self.max_graphs)
+        return AnalysisState(data["results"], graph, df)
+
+
+def create_state_store():
+    """Redis when REDIS_URL is set and redis-py is installed, else in-memory."""
+    url = os.getenv("REDIS_URL")
+    if url and REDIS_AVAILABLE:
+        logger.info("Using Redis state store")
+        return RedisStateStore(url, ttl=int(os.getenv("STATE_TTL_SECONDS", "3600")),
+                               max_graphs=int(os.getenv("STATE_MAX_SESSIONS", "16")))
+    if url:
+        logger.warning("REDIS_URL set but redis is not installed "
+                       "(pip install -r requirements-optional.txt) — using in-memory state store")
+    return MemoryStateStore(max_sessions=int(os.getenv("STATE_MAX_SESSIONS", "16")))
@@ -75,7 +75,12 @@ export default async function handler(req, res) {
   }
 
   // ── 6. Stream the response back ────────────────────────────────────────
-  const skipResponseHeaders = new Set(['transfer-encoding', 'connection', 'keep-alive'])
+  //   fetch() has already decoded any gzip body from the backend, so its
+  //   content-encoding / content-length describe bytes we no longer hold —
+  //   drop them and let res.end() set the length of the decoded buffer.
+  const skipResponseHeaders = new Set([
+    'transfer-encoding', 'connection', 'keep-alive', 'content-encoding', 'content-length',
+  ])
   for (const [key, value] of upstream.headers.entries()) {
     if (!skipResponseHeaders.has(key.toLowerCase())) {
       res.setHeader(key, value)
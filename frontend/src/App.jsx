@@ -51,6 +51,14 @@ export default function App() {
       const data = await resp.json()
       setResults(data)
       setPipelineStep(7) // all done
+
+      // Large graphs: the viz payload is served separately, fetch it now
+      if (!data.graph_data && data.graph_data_url) {
+        fetch(apiUrl(data.graph_data_url))
+          .then(r => (r.ok ? r.json() : null))
+          .then(graph => graph && setResults(prev => (prev ? { ...prev, graph_data: graph } : prev)))
+          .catch(() => {})
+      }
     } catch (e) {
       setError(e.message)
       setPipelineStep(-1)
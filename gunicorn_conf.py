@@ -0,0 +1,22 @@
+"""
+Gunicorn config — multi-worker alternative to the plain uvicorn start command:
+
+    gunicorn -c gunicorn_conf.py app.main:app
+
+UvicornWorker runs each worker on uvloop + httptools (both ship with
+uvicorn[standard]).
+"""
+
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+worker_class = "uvicorn.workers.UvicornWorker"
+
+# Analysis state for download + What-If lives in per-process memory unless
+# REDIS_URL is set, so keep one worker unless WEB_CONCURRENCY is raised deliberately.
+workers = int(os.getenv("WEB_CONCURRENCY", "1"))
+
+# Long CSV analyses — match the uvicorn keep-alive / graceful-shutdown settings
+timeout = 120
+graceful_timeout = 120
+keepalive = 120
@@ -0,0 +1,32 @@
+"""
+Native ASGI entry point
+=======================
+For a VPS / container behind a reverse proxy (nginx → 127.0.0.1:8000):
+
+    python run_asgi.py
+
+Serves app.main:app on uvicorn's uvloop + httptools stack (both ship with
+uvicorn[standard]) — no a2wsgi bridge, so requests never hop through a
+sync→async queue. wsgi.py remains only for PythonAnywhere's mod_wsgi hosting.
+"""
+
+import os
+
+import uvicorn
+
+if __name__ == "__main__":
+    # Analysis state is per-process unless REDIS_URL is set — one worker by
+    # default then, one per core once sessions are shared (see gunicorn_conf.py)
+    default_workers = (os.cpu_count() or 1) if os.getenv("REDIS_URL") else 1
+    uvicorn.run(
+        "app.main:app",
+        host=os.getenv("HOST", "0.0.0.0"),
+        port=int(os.getenv("PORT", "8000")),
+        workers=int(os.getenv("WEB_CONCURRENCY", str(default_workers))),
+        loop="uvloop",
+        http="httptools",
+        access_log=False,
+        proxy_headers=True,          # trust X-Forwarded-* from the proxy
+        timeout_keep_alive=120,
+        timeout_graceful_shutdown=120,
+    )
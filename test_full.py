@@ -1,103 +1,248 @@
 """Quick full test of all features."""
-import urllib.request, json
-
-with open('test_data.csv', 'rb') as f:
-    csv_data = f.read()
-
-boundary = '----WebKitFormBoundary7MA4YWxkTrZu0gW'
-body = (
-    f'------WebKitFormBoundary7MA4YWxkTrZu0gW\r\n'
-    f'Content-Disposition: form-data; name="file"; filename="test_data.csv"\r\n'
-    f'Content-Type: text/csv\r\n\r\n'
-).encode() + csv_data + b'\r\n------WebKitFormBoundary7MA4YWxkTrZu0gW--\r\n'
-
-req = urllib.request.Request(
-    'http://localhost:8000/api/analyze',
-    data=body,
-    headers={'Content-Type': f'multipart/form-data; boundary=----WebKitFormBoundary7MA4YWxkTrZu0gW'},
-    method='POST'
-)
-resp = urllib.request.urlopen(req, timeout=120)
-data = json.loads(resp.read().decode())
-
-print('=== ANALYSIS RESULT ===')
-sa = data.get('suspicious_accounts', [])
-fr = data.get('fraud_rings', [])
-print(f'Suspicious accounts: {len(sa)}')
-print(f'Fraud rings: {len(fr)}')
-print(f'Processing time: {data["summary"]["processing_time_seconds"]}s')
-
-print('\n=== DISRUPTION ENGINE ===')
-d = data.get('disruption', {})
-gs = d.get('global_summary', {})
-print(f'Strategies: {len(d.get("strategies", []))}')
-print(f'Critical nodes: {gs.get("unique_critical_nodes", 0)}')
-print(f'Avg disruption: {gs.get("avg_disruption_potential", 0)}%')
-print(f'Net resilience: {gs.get("network_resilience_score", 0)}%')
-ns = d.get('network_stats', {})
-print(f'Articulation points: {ns.get("articulation_point_count", 0)}')
-tb = ns.get('top_betweenness', [])
-print(f'Top betweenness: {tb[0]["account_id"] if tb else "N/A"}')
-
-# Show first strategy details
-strats = d.get('strategies', [])
-if strats:
-    s0 = strats[0]
-    print(f'\nFirst ring: {s0["ring_id"]} ({s0["member_count"]} members)')
-    print(f'  Max disruption: {s0["max_disruption_pct"]}%')
-    print(f'  Critical nodes: {len(s0["critical_nodes"])}')
-    opt = s0.get('optimal_pair_removal', {})
-    if opt.get('nodes'):
-        print(f'  Optimal pair: {opt["nodes"]} -> {opt["combined_impact"]}%')
-    qo = s0.get('quantum_overlay', {})
-    if qo.get('available'):
-        print(f'  Quantum overlay: susp={len(qo["suspicious_partition"])}, clean={len(qo["clean_partition"])}')
-
-print('\n=== CRIME TEAM ===')
-ct = data.get('crime_team', {})
-print(f'Conversation msgs: {len(ct.get("conversation", []))}')
-print(f'Evidence chain: {len(ct.get("evidence_chain", []))}')
-print(f'Actions: {len(ct.get("recommended_actions", []))}')
-print(f'Timeline steps: {len(ct.get("investigation_timeline", []))}')
-cf = ct.get('confidence_assessment', {})
-print(f'Confidence: {cf.get("overall_confidence", 0)}% ({cf.get("confidence_level", "N/A")})')
-case = ct.get('case_file', {})
-print(f'Case number: {case.get("case_number", "N/A")}')
-print(f'Priority: {case.get("priority", "N/A")}')
-
-# Show conversation preview
-conv = ct.get('conversation', [])
-for msg in conv[:3]:
-    print(f'  [{msg["agent_name"]}]: {msg["content"][:80]}...')
-
-print('\n=== QUANTUM ===')
-q = data.get('quantum_analysis', {})
-print(f'Circuits: {q.get("circuits_executed", 0)}')
-
-print('\n=== WHAT-IF TEST ===')
-# Test What-If simulator
-if sa:
-    top3 = [a['account_id'] for a in sa[:3]]
-    wi_body = json.dumps({'nodes': top3}).encode()
-    wi_req = urllib.request.Request(
-        'http://localhost:8000/api/whatif',
-        data=wi_body,
+import asyncio
+import os
+import pickle
+import sys
+from pathlib import Path
+
+import httpx
+import numpy as np
+import orjson
+
+from _multipart import build_multipart
+
+BASE_URL = 'http://localhost:8000'
+# Keep-alive pool sized for the what-if sweep; connect failures retried 3×
+POOL_LIMITS = httpx.Limits(max_connections=16, max_keepalive_connections=16)
+CONNECT_RETRIES = 3
+WHATIF_TOP_K = 5
+
+CSV_PATH = 'test_data.csv'
+CACHE_DIR = Path('.cache')  # parsed /api/analyze responses by CSV sha256; only with USE_CACHE=1
+BOUNDARY = '----WebKitFormBoundary7MA4YWxkTrZu0gW'
+
+
+async def warm_up(client):
+    # Resolve localhost and park one keep-alive socket in the pool before the
+    # timed calls, so the what-if sweep doesn't pay DNS + TCP connect
+    try:
+        await client.get(f'{BASE_URL}/api/health', timeout=2)
+    except httpx.HTTPError:
+        pass
+
+
+async def upload_csv(client, upload):
+    """Stream the multipart body from disk. Returns (wire size, encoding, decoded body)."""
+    resp = await client.post(
+        f'{BASE_URL}/api/analyze',
+        content=upload.achunks(),
+        headers=upload.headers,
+        timeout=120,
+    )
+    resp.raise_for_status()
+    wire = resp.headers.get('Content-Length')
+    wire = f'{int(wire):,} B' if wire else 'chunked'
+    return wire, resp.headers.get('Content-Encoding', 'identity'), resp.content
+
+
+async def check_rejects_non_utf8(client):
+    # Latin-1 account names must fail at parse time, not reach the agents as bytes
+    csv = (
+        'transaction_id,sender_id,receiver_id,amount,timestamp\n'
+        'T1,José,ACC_B,100.0,2024-01-01 10:00:00\n'
+        'T2,ACC_B,José,50.0,2024-01-01 11:00:00\n'
+    ).encode('latin-1')
+    resp = await client.post(
+        f'{BASE_URL}/api/analyze',
+        files={'file': ('latin1.csv', csv, 'text/csv')},
+        timeout=30,
+    )
+    assert resp.status_code == 400, f'non-UTF-8 CSV: expected 400, got {resp.status_code}'
+
+
+async def post_whatif(client, body):
+    resp = await client.post(
+        f'{BASE_URL}/api/whatif',
+        content=body,
         headers={'Content-Type': 'application/json'},
-        method='POST'
+        timeout=30,
     )
-    wi_resp = urllib.request.urlopen(wi_req, timeout=30)
-    wi = json.loads(wi_resp.read().decode())
+    resp.raise_for_status()
+    wi = orjson.loads(resp.content)
+    assert isinstance(wi.get('nodes_removed'), list), 'whatif: nodes_removed missing'
+    assert isinstance(wi.get('effectiveness_score'), dict), 'whatif: effectiveness_score missing'
+    return wi
+
+
+async def main():
+    # One pooled client for the what-if sweep — it picks up the session cookie
+    # from the upload. gzip only: the server's GZipMiddleware speaks it
+    transport = httpx.AsyncHTTPTransport(limits=POOL_LIMITS, retries=CONNECT_RETRIES)
+    async with httpx.AsyncClient(transport=transport, headers={'Accept-Encoding': 'gzip'}) as client:
+        await warm_up(client)
+        upload = build_multipart(CSV_PATH, 'file', BOUNDARY)
+        cache_path = CACHE_DIR / f'report-{upload.sha256}.pkl'
+        use_cache = os.getenv('USE_CACHE') == '1'
+        cached = use_cache and cache_path.exists()
+        if cached:
+            data = pickle.loads(cache_path.read_bytes())
+            note = f'(cached analysis from {cache_path} — /api/analyze was not called)'
+        else:
+            # The session cookie lands in the client's jar for the what-if calls
+            wire, encoding, body = await upload_csv(client, upload)
+            data = orjson.loads(body)
+            check_analysis(data)
+            note = f'(analyze response: {wire} on the wire [{encoding}], {len(body):,} B decoded)'
+            if use_cache:
+                CACHE_DIR.mkdir(exist_ok=True)
+                cache_path.write_bytes(pickle.dumps(data, pickle.HIGHEST_PROTOCOL))
+        report_analysis(data)
+        print(note)
+
+        print('\n=== WHAT-IF TEST ===')
+        if cached:
+            # Nothing was uploaded, so the server's analysis may be for another CSV
+            print('Skipped: analysis came from the cache (unset USE_CACHE to run it)')
+            return False
+        # Independent ablation scenarios, all in flight at once: wall time is
+        # the slowest one, and the server's thread pool sees real contention
+        scenarios = whatif_scenarios(data)
+        if scenarios:
+            # Encode each distinct node list once, straight to bytes
+            encoded = {}
+            for nodes in scenarios.values():
+                if tuple(nodes) not in encoded:
+                    encoded[tuple(nodes)] = orjson.dumps({'nodes': nodes})
+            bodies = [encoded[tuple(nodes)] for nodes in scenarios.values()]
+            results = await asyncio.gather(*[post_whatif(client, body) for body in bodies])
+            report_whatif(results[0])
+            print(f'\nScenario sweep ({len(scenarios)} concurrent):')
+            sys.stdout.write(''.join(
+                f'  {name:<24} {len(wi["nodes_removed"])} removed -> '
+                f'{wi["effectiveness_score"].get("overall", 0)}% (Grade: {wi["effectiveness_score"].get("grade", "?")})\n'
+                for name, wi in zip(scenarios, results)
+            ))
+
+        print('\n=== ENCODING TEST ===')
+        await check_rejects_non_utf8(client)
+        print('Non-UTF-8 CSV rejected with 400')
+        return True
+
+
+def check_analysis(data):
+    """Fail loudly if /api/analyze dropped a section this script reads."""
+    assert isinstance(data.get('suspicious_accounts'), list), 'analyze: suspicious_accounts missing'
+    assert isinstance(data.get('fraud_rings'), list), 'analyze: fraud_rings missing'
+    assert 'processing_time_seconds' in data.get('summary', {}), 'analyze: summary missing'
+    assert isinstance(data.get('disruption'), dict), 'analyze: disruption missing'
+
+
+def whatif_scenarios(data):
+    """name -> node list; the first entry (top-3 suspects) gets the detailed report."""
+    top = [a['account_id'] for a in data.get('suspicious_accounts', [])[:WHATIF_TOP_K]]
+    if not top:
+        return {}
+    d = data.get('disruption', {})
+    ns = d.get('network_stats', {})
+    scenarios = {'top-3 suspects': top[:3]}
+    scenarios.update({f'{acc} alone': [acc] for acc in top[:3]})
+    scenarios['top-2 suspects'] = top[:2]
+    scenarios[f'top-{len(top)} suspects'] = top
+    by_degree = [a['account_id'] for a in ns.get('top_degree_centrality', [])[:WHATIF_TOP_K]]
+    if by_degree:
+        scenarios[f'top-{len(by_degree)} by degree'] = by_degree
+    by_betweenness = [a['account_id'] for a in ns.get('top_betweenness', [])[:3]]
+    if by_betweenness:
+        scenarios[f'top-{len(by_betweenness)} by betweenness'] = by_betweenness
+    strats = d.get('strategies', [])
+    pair = strats[0].get('optimal_pair_removal', {}).get('nodes') if strats else None
+    if pair:
+        scenarios['ring 1 optimal pair'] = pair
+    return scenarios
+
+
+def report_analysis(data):
+    print('=== ANALYSIS RESULT ===')
+    sa = data.get('suspicious_accounts', [])
+    fr = data.get('fraud_rings', [])
+    print(f'Suspicious accounts: {len(sa)}')
+    print(f'Fraud rings: {len(fr)}')
+    print(f'Processing time: {data["summary"]["processing_time_seconds"]}s')
+    if sa:
+        scores = np.fromiter((a.get('suspicion_score', 0) for a in sa), dtype=np.float32, count=len(sa))
+        print(f'Suspicion score: mean {scores.mean():.1f}, max {scores.max():.1f}, '
+            f'>=70: {int((scores >= 70).sum())}')
+
+    print('\n=== DISRUPTION ENGINE ===')
+    d = data.get('disruption', {})
+    gs = d.get('global_summary', {})
+    strats = d.get('strategies', [])
+    print(f'Strategies: {len(strats)}')
+    if strats:
+        # One pass over the strategies into columns; the stats are array reductions
+        n = len(strats)
+        crit = np.fromiter((len(st['critical_nodes']) for st in strats), dtype=np.int32, count=n)
+        max_pct = np.fromiter((st['max_disruption_pct'] for st in strats), dtype=np.float32, count=n)
+        print(f'Critical nodes per ring: total {int(crit.sum())}, max {int(crit.max())}; '
+            f'ring max disruption: mean {max_pct.mean():.1f}%, min {max_pct.min():.1f}%')
+    print(f'Critical nodes: {gs.get("unique_critical_nodes", 0)}')
+    print(f'Avg disruption: {gs.get("avg_disruption_potential", 0)}%')
+    print(f'Net resilience: {gs.get("network_resilience_score", 0)}%')
+    ns = d.get('network_stats', {})
+    print(f'Articulation points: {ns.get("articulation_point_count", 0)}')
+    tb = ns.get('top_betweenness', [])
+    print(f'Top betweenness: {tb[0]["account_id"] if tb else "N/A"}')
+
+    # Show first strategy details
+    if strats:
+        s0 = strats[0]
+        print(f'\nFirst ring: {s0["ring_id"]} ({s0["member_count"]} members)')
+        print(f'  Max disruption: {s0["max_disruption_pct"]}%')
+        print(f'  Critical nodes: {len(s0["critical_nodes"])}')
+        opt = s0.get('optimal_pair_removal', {})
+        if opt.get('nodes'):
+            print(f'  Optimal pair: {opt["nodes"]} -> {opt["combined_impact"]}%')
+        qo = s0.get('quantum_overlay', {})
+        if qo.get('available'):
+            print(f'  Quantum overlay: susp={len(qo["suspicious_partition"])}, clean={len(qo["clean_partition"])}')
+
+    print('\n=== CRIME TEAM ===')
+    ct = data.get('crime_team', {})
+    conv = ct.get('conversation', [])
+    print(f'Conversation msgs: {len(conv)}')
+    print(f'Evidence chain: {len(ct.get("evidence_chain", []))}')
+    print(f'Actions: {len(ct.get("recommended_actions", []))}')
+    print(f'Timeline steps: {len(ct.get("investigation_timeline", []))}')
+    cf = ct.get('confidence_assessment', {})
+    print(f'Confidence: {cf.get("overall_confidence", 0)}% ({cf.get("confidence_level", "N/A")})')
+    case = ct.get('case_file', {})
+    print(f'Case number: {case.get("case_number", "N/A")}')
+    print(f'Priority: {case.get("priority", "N/A")}')
+
+    # Show conversation preview
+    sys.stdout.write(''.join(f'  [{msg["agent_name"]}]: {msg["content"][:80]}...\n' for msg in conv[:3]))
+
+    print('\n=== QUANTUM ===')
+    q = data.get('quantum_analysis', {})
+    print(f'Circuits: {q.get("circuits_executed", 0)}')
+
+
+def report_whatif(wi):
     print(f'Removed: {wi["nodes_removed"]}')
     eff = wi.get('effectiveness_score', {})
     print(f'Effectiveness: {eff.get("overall", 0)}% (Grade: {eff.get("grade", "?")})')
     print(f'Edge disruption: {eff.get("edge_disruption", 0)}%')
     print(f'Ring destruction: {eff.get("ring_destruction_rate", 0)}%')
     ri = wi.get('ring_impacts', [])
-    for r in ri[:3]:
-        print(f'  {r["ring_id"]}: {r["status"]} ({r["disruption_pct"]}%)')
+    sys.stdout.write(''.join(f'  {r["ring_id"]}: {r["status"]} ({r["disruption_pct"]}%)\n' for r in ri[:3]))
     flow = wi.get('flow_impact', {})
     print(f'Flow disrupted: ${flow.get("disrupted_flow", 0):,.0f} ({flow.get("disruption_pct", 0)}%)')
     ai = wi.get('account_impacts', {})
     print(f'Risk reduction: {ai.get("risk_reduction_pct", 0)}%')
 
-print('\n=== ALL TESTS PASSED ===')
+
+if __name__ == '__main__':
+    if asyncio.run(main()):
+        print('\n=== ALL TESTS PASSED ===')
+    else:
+        print('\n=== REPORT FROM CACHE — SERVER NOT TESTED ===')
@@ -1,37 +1,83 @@
 """Quick integration test for the LLM-powered crime team."""
-import urllib.request
-import json
+import os
+import pickle
+import sys
+from pathlib import Path
+
+import httpx
+import orjson
+
+from _multipart import build_multipart
+
+# Optional: ijson streams the response and builds only the subtrees read below
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
 
 boundary = "----FormBoundary123"
 csv_path = r"c:\rift\test_data.csv"
+BASE_URL = "http://localhost:8000"
+CACHE_DIR = Path(".cache")  # crime_team/summary subset by CSV sha256; only with USE_CACHE=1
+WANTED_KEYS = ("crime_team", "summary")
+
+
+def read_wanted(chunks):
+    """{key: subtree} for WANTED_KEYS — with ijson, disruption / graph_data etc. are parsed past, never built."""
+    if not IJSON_AVAILABLE:
+        data = orjson.loads(b"".join(chunks))
+        return {k: data[k] for k in WANTED_KEYS if k in data}
+    events = ijson.sendable_list()
+    parser = ijson.parse_coro(events, use_float=True)
+    builders = {}
+
+    def consume():
+        for prefix, event, value in events:
+            key = prefix.partition(".")[0]
+            if key in WANTED_KEYS:
+                builders.setdefault(key, ijson.ObjectBuilder()).event(event, value)
+        del events[:]
 
-with open(csv_path, "rb") as f:
-    csv_data = f.read()
+    for chunk in chunks:
+        parser.send(chunk)
+        consume()
+    parser.close()
+    consume()
+    return {k: b.value for k, b in builders.items()}
 
-body = (
-    f"--{boundary}\r\n"
-    f'Content-Disposition: form-data; name="file"; filename="test_data.csv"\r\n'
-    f"Content-Type: text/csv\r\n\r\n"
-).encode() + csv_data + f"\r\n--{boundary}--\r\n".encode()
 
-req = urllib.request.Request(
-    "http://localhost:8000/api/analyze",
-    data=body,
-    headers={"Content-Type": f"multipart/form-data; boundary={boundary}"},
-    method="POST",
-)
-resp = urllib.request.urlopen(req, timeout=120)
-data = json.loads(resp.read())
+upload = build_multipart(csv_path, "file", boundary)
+cache_path = CACHE_DIR / f"crime-team-{upload.sha256}.pkl"
+use_cache = os.getenv("USE_CACHE") == "1"
+if use_cache and cache_path.exists():
+    data = pickle.loads(cache_path.read_bytes())
+    print(f"(cached from {cache_path} - /api/analyze was not called)")
+else:
+    with httpx.Client(headers={"Accept-Encoding": "gzip"}, timeout=120) as client:
+        # Warm-up: resolve localhost and open the keep-alive socket before the timed POST
+        try:
+            client.get(f"{BASE_URL}/api/health")
+        except httpx.HTTPError:
+            pass
+        with client.stream("POST", f"{BASE_URL}/api/analyze", content=upload.chunks(), headers=upload.headers) as resp:
+            if resp.status_code != 200:
+                raise SystemExit(f"/api/analyze returned {resp.status_code}: {resp.read()[:200]!r}")
+            data = read_wanted(resp.iter_bytes(1 << 16))
+    if use_cache:
+        CACHE_DIR.mkdir(exist_ok=True)
+        cache_path.write_bytes(pickle.dumps(data, pickle.HIGHEST_PROTOCOL))
 
 ct = data.get("crime_team", {})
 print("=== CRIME TEAM ===")
 print(f"AI Powered: {ct.get('ai_powered', False)}")
 print(f"LLM Model:  {ct.get('llm_model', 'None')}")
-print(f"Messages:   {len(ct.get('conversation', []))}")
-for m in ct.get("conversation", [])[:3]:
-    has_ai = m.get("ai_generated", False)
-    tag = " [AI]" if has_ai else ""
-    print(f"  [{m['agent_name']}]{tag} ({m['phase']}) {m['content'][:100]}...")
+conv = ct.get("conversation") or []
+print(f"Messages:   {len(conv)}")
+sys.stdout.write("".join(
+    f"  [{m['agent_name']}]{' [AI]' if m.get('ai_generated') else ''} ({m['phase']}) {m['content'][:100]}...\n"
+    for m in conv[:3]
+))
 print(f"Evidence:   {len(ct.get('evidence_chain', []))}")
 print(f"Actions:    {len(ct.get('recommended_actions', []))}")
 conf = ct.get("confidence_assessment", {})
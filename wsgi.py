@@ -3,6 +3,8 @@ PythonAnywhere WSGI entry point
 ================================
 PythonAnywhere serves Python web apps via Apache + mod_wsgi (WSGI protocol).
 FastAPI is an ASGI framework, so we use `a2wsgi` to bridge the gap.
+This bridge is for PythonAnywhere only — anywhere an ASGI server can run
+(a VPS behind nginx, Render, Railway) use run_asgi.py / the Procfile instead.
 
 Setup steps on PythonAnywhere:
   1. Upload / clone this repo to /home/<username>/rift
@@ -21,6 +23,10 @@ Setup steps on PythonAnywhere:
        LLM_MAX_TURNS=6
   8. Reload the web app
 
+uvloop (pulled in by uvicorn[standard]) drives a2wsgi's event-loop thread when
+its manylinux wheel installs — fine on the Hacker tier; otherwise the stdlib
+asyncio loop is used unchanged.
+
 NOTE: PythonAnywhere FREE tier blocks outbound HTTP to non-whitelisted domains.
       Groq API (api.groq.com) works on the PAID tier ("Hacker" plan, $5/mo).
       On the free tier the LLM crime-team falls back to the template engine.
@@ -29,6 +35,7 @@ NOTE: PythonAnywhere FREE tier blocks outbound HTTP to non-whitelisted domains.
 
 import sys
 import os
+import asyncio
 
 # ── Make sure the project root is on the Python path ──────────────────────
 # Change this path to match your PythonAnywhere username / folder.
@@ -40,9 +47,17 @@ if PROJECT_ROOT not in sys.path:
 from dotenv import load_dotenv
 load_dotenv(os.path.join(PROJECT_ROOT, ".env"))
 
+# ── Prefer uvloop for a2wsgi's loop (must be set before the middleware) ───
+try:
+    import uvloop
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+except ImportError:
+    pass
+
 # ── Wrap FastAPI (ASGI) with a2wsgi so Apache mod_wsgi can call it ─────────
 from a2wsgi import ASGIMiddleware
 from app.main import app as _asgi_app
 
-# `application` is the name mod_wsgi looks for
+# `application` is the name mod_wsgi looks for. One module-level instance, so
+# every request in this process is scheduled on the same background loop.
 application = ASGIMiddleware(_asgi_app)